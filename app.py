@@ -1,13 +1,21 @@
-import streamlit as st
-import tempfile
+import time
+_script_start = time.perf_counter()
+
+import base64
+import importlib
 import os
-import fitz  # PyMuPDF
-import plotly.graph_objects as go
-from export_pdf import generate_pdf_report
-from extractor.Skill_extractor import extract_skills_with_exact_match
-from domainn_predictor import predict_top_roles_domains, get_gap_skills
-import plotly.io as pio
-pio.kaleido.scope.default_format = "png"
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from result_cache import cache_from_env, cache_key, file_checksum
+from work_pool import Busy, WorkPool
+import metrics
+
+# Heavy modules are imported where they're first needed so the landing page
+# renders without paying for them:
+#   fitz (PyMuPDF)            -> when a file is uploaded
+#   extractor / model         -> background warm-up started after first render
+#   plotly                    -> when the match chart is drawn
+#   export_pdf (fpdf)         -> when a report is requested
 
 # -------------- Dummy Role/Domain descriptions --------------
 # Replace with your actual descriptions
@@ -74,6 +82,14 @@ DOMAIN_DESCRIPTIONS = {
     # Add more domains here...
 }
 
+# Long CVs and scanned portfolios are capped so one upload can't stall the app
+MAX_PDF_PAGES = 40
+MAX_PDF_CHARS = 200_000
+
+# Serves /metrics when SKILLFIT_METRICS=1 and SKILLFIT_METRICS_PORT are set
+if metrics.ENABLED:
+    metrics.start_exporter()
+
 # ------------------ Streamlit Config ------------------ #
 st.set_page_config(page_title="SkillFit: Role Matcher & Upskill Analyzer", layout="wide")
 
@@ -91,75 +107,211 @@ st.markdown("---")
 st.sidebar.header(" Upload Resume/linkedin Profile")
 uploaded_file = st.sidebar.file_uploader("Choose a PDF file", type=["pdf"])
 
-def display_pdf_preview_in_sidebar(pdf_path):
-    doc = fitz.open(pdf_path)
+@metrics.timed("preview_render")
+def render_pdf_preview(doc):
+    import fitz  # PyMuPDF
+
     page = doc.load_page(0)
     pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))  # Small preview
-    image_path = os.path.join(tempfile.gettempdir(), "preview.png")
-    pix.save(image_path)
+    return pix.tobytes("png")
 
+def display_pdf_preview_in_sidebar(preview_png):
     with st.sidebar.expander(" Preview Uploaded Resume"):
-        st.image(image_path, caption="Page 1 Preview", use_container_width=True)
+        st.image(preview_png, caption="Page 1 Preview", use_container_width=True)
+
+# ------------------ Result Cache ------------------ #
+# Shared by all sessions of this process; set SKILLFIT_CACHE_DB to also share
+# results across worker processes through SQLite.
+@st.cache_resource
+def get_result_cache():
+    return cache_from_env()
+
+# ------------------ Shared Work Pool ------------------ #
+# Preview rendering, analysis and PDF reports from every session run here,
+# a bounded number at a time; a full queue shows a "busy, retry" message
+# (SKILLFIT_WORKERS / SKILLFIT_QUEUE_DEPTH / SKILLFIT_QUEUE_TIMEOUT).
+@st.cache_resource
+def get_work_pool():
+    return WorkPool()
+
+def show_busy(e):
+    st.warning(f" SkillFit is busy with other resumes right now. Please retry in about {e.retry_after}s.")
+    st.button(" Retry")
+    st.stop()
+
+# ------------------ Model Warm-up ------------------ #
+def _warm_up(skill_json_path):
+    # Runs on a background thread: import and load everything the analysis
+    # needs (PyMuPDF, skill matcher, model artifacts) and hand back the modules.
+    extractor = importlib.import_module("extractor.Skill_extractor")
+    extractor.load_skill_matcher(skill_json_path)
+    predictor = importlib.import_module("domainn_predictor")
+    predictor.get_skill_market()
+    predictor.start_watcher()
+    return extractor, predictor
+
+@st.cache_resource
+def get_model_loader():
+    # Started once per process; callers that need the model wait on the future.
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="skillfit-warmup")
+    future = executor.submit(_warm_up, "skills.json")
+    executor.shutdown(wait=False)       # the thread exits once the warm-up is done
+    return future
+
+def get_pipeline():
+    future = get_model_loader()
+    if future.done() and future.exception() is not None:
+        # A failed warm-up (missing artifact, I/O error) is retried on the
+        # next run instead of re-raising the cached error until restart.
+        get_model_loader.clear()
+        future = get_model_loader()
+    with metrics.span("model_wait"):
+        return future.result()
+
+@st.cache_resource
+def get_posting_index():
+    # Memory-mapped posting matrix; built on first use if missing or stale.
+    posting_search = importlib.import_module("posting_search")
+    return posting_search.open_index()
+
+@metrics.timed("analysis_pipeline")
+def analyze_resume(pdf_doc, skill_json_path, pipeline):
+    # Extract skills -> predict roles/domains -> gap analysis for the top 3,
+    # returned in a JSON-friendly shape so it can be cached. Runs on the
+    # work pool, so no Streamlit calls in here.
+    extractor, predictor = pipeline
+    extracted_skills = extractor.extract_skills_with_exact_match(
+        pdf_doc, skill_json_path, max_pages=MAX_PDF_PAGES, max_chars=MAX_PDF_CHARS
+    )
+    if not extracted_skills:
+        return {"skills": [], "top_5": [], "gaps": []}
+
+    top_5 = predictor.predict_top_roles_domains(extracted_skills)
+    gap_info_list = predictor.get_gap_skills_for_predictions(extracted_skills, top_5, min(3, len(top_5)))
+    return {
+        "skills": extracted_skills,
+        "top_5": [[role, domain, float(score)] for role, domain, score in top_5],
+        "gaps": [[sorted(user), sorted(required), sorted(gap)] for user, required, gap in gap_info_list],
+    }
+
+# ------------------ Enhanced Match Percentage Bar Chart ------------------ #
+@metrics.timed("chart_build")
+def build_match_chart(roles, scores):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=roles[::-1],
+        x=scores[::-1],
+        orientation='h',
+        marker=dict(
+            color=scores[::-1],
+            colorscale='Viridis',
+            line=dict(color='white', width=1.5)
+        ),
+        text=[f"{s}%" for s in scores[::-1]],
+        textposition='outside',
+        hovertemplate='%{y}<br>Match: %{x}%<extra></extra>',
+    ))
+
+    fig.update_layout(
+        title=' Match Percentage for Top Predicted Roles',
+        xaxis=dict(title='Match %', range=[0, 100]),
+        yaxis=dict(title='Role | Domain'),
+        height=420,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(250,250,250,1)',
+    )
+    return fig
+
+# ------------------ Startup Profiling ------------------ #
+# Everything above is what a cold landing page costs.
+time_to_first_render = time.perf_counter() - _script_start
+metrics.observe("time_to_first_render_seconds", time_to_first_render, "Script start to landing page rendered")
+if os.environ.get("SKILLFIT_PROFILE_STARTUP"):
+    print(f"[startup] time to first render: {time_to_first_render * 1000:.1f} ms")
+
+# Kick off model loading in the background now that the page is visible.
+get_model_loader()
 
 # ------------------ Main Section ------------------ #
 if uploaded_file:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-        tmp_pdf.write(uploaded_file.read())
-        tmp_pdf_path = tmp_pdf.name
+    import fitz  # PyMuPDF
+    from skill_normalization import FUZZY_THRESHOLD, MATCHER_VERSION
+
+    pdf_bytes = uploaded_file.getvalue()
+    skill_json_path = "skills.json"
+    result_cache = get_result_cache()
+    pipeline = get_pipeline()
+    _, predictor = pipeline
+    result_key = cache_key(pdf_bytes, predictor.model_version, f"{file_checksum(skill_json_path)}:{FUZZY_THRESHOLD}:{MATCHER_VERSION}")
+
+    # The preview is cached next to the result (base64, so the SQLite tier can
+    # hold it); a rerun or re-upload of a known PDF never touches the pool.
+    preview_key = f"{result_key}:preview"
+    preview = result_cache.get(preview_key)
+    result = result_cache.get(result_key)
+    metrics.inc("result_cache_misses_total" if result is None else "result_cache_hits_total")
+    if preview is None or result is None:
+        # Opened straight from the upload buffer; one document serves both the
+        # preview and skill extraction, nothing touches the disk.
+        pdf_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        work_pool = get_work_pool()
+        try:
+            if preview is None:
+                preview = base64.b64encode(work_pool.run("preview", render_pdf_preview, pdf_doc)).decode("ascii")
+                result_cache.put(preview_key, preview)
+
+            # Extract Skills, predict and analyse gaps (cached across reruns and re-uploads)
+            if result is None:
+                result = work_pool.run("analysis", analyze_resume, pdf_doc, skill_json_path, pipeline)
+                result_cache.put(result_key, result)
+                metrics.dump_jsonl()
+        except Busy as e:
+            show_busy(e)
+        finally:
+            pdf_doc.close()
 
     # Show Preview
-    display_pdf_preview_in_sidebar(tmp_pdf_path)
+    display_pdf_preview_in_sidebar(base64.b64decode(preview))
 
-    # Extract Skills
-    skill_json_path = "skills.json"
-    extracted_skills = extract_skills_with_exact_match(tmp_pdf_path, skill_json_path)
-    os.remove(tmp_pdf_path)
+    extracted_skills = result["skills"]
+    top_5 = [tuple(prediction) for prediction in result["top_5"]]
+    gap_info_list = [tuple(set(skills) for skills in gaps) for gaps in result["gaps"]]
 
     if extracted_skills:
+        # Add a Generate PDF button in the sidebar. Clicking it only queues the
+        # report on a background thread so the page below keeps rendering.
+        with st.sidebar:
+            generate_pdf_btn = st.button(" Generate & Download PDF Report")
+            report_slot = st.empty()
+
+        report_job = st.session_state.get("pdf_report_job")
+        if report_job is not None and report_job[0] != result_key:
+            report_job = None  # belongs to a previous upload
+        if generate_pdf_btn and report_job is None:
+            from export_pdf import render_pdf_report  # report-only dependency
+
+            try:
+                report_job = (result_key, get_work_pool().submit(
+                    "report", render_pdf_report, extracted_skills, top_5, gap_info_list
+                ))
+                st.session_state["pdf_report_job"] = report_job
+            except Busy as e:
+                report_slot.warning(f"⚠ Too busy to build the report now. Please retry in about {e.retry_after}s.")
+
         with st.expander(" View Extracted Skills", expanded=True):
             st.write(", ".join(sorted([s.title() for s in extracted_skills])))
 
-        # Predict roles/domains
-        top_5 = predict_top_roles_domains(extracted_skills)
         roles = [f"{role} | {domain}" for role, domain, _ in top_5]
         scores = [int(score * 100) for _, _, score in top_5]
 
         # ------------------ Enhanced Match Percentage Bar Chart ------------------ #
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            y=roles[::-1],
-            x=scores[::-1],
-            orientation='h',
-            marker=dict(
-                color=scores[::-1],
-                colorscale='Viridis',
-                line=dict(color='white', width=1.5)
-            ),
-            text=[f"{s}%" for s in scores[::-1]],
-            textposition='outside',
-            hovertemplate='%{y}<br>Match: %{x}%<extra></extra>',
-        ))
-
-        fig.update_layout(
-            title=' Match Percentage for Top Predicted Roles',
-            xaxis=dict(title='Match %', range=[0, 100]),
-            yaxis=dict(title='Role | Domain'),
-            height=420,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(250,250,250,1)',
-        )
-
+        fig = build_match_chart(roles, scores)
         st.plotly_chart(fig, use_container_width=True)
 
         # ------------ Skill Gap Insights ---------------- #
-        top_n = min(3, len(top_5))  
-
-        # Prepare gap info list for report and display
-        gap_info_list = []
-        for i in range(top_n):
-            role, domain, score = top_5[i]
-            user, required, gap = get_gap_skills(extracted_skills, role, domain)
-            gap_info_list.append((user, required, gap))
+        top_n = len(gap_info_list)
 
         st.markdown("### Skill Gap Analysis & Upskilling Suggestions")
         st.write("Explore personalized improvement areas for your top role matches:")
@@ -197,36 +349,74 @@ if uploaded_file:
                     st.write(", ".join(sorted([s.title() for s in required])) if required else "Not Specified")
 
                 with col3:
-                    st.markdown(f"*Gap Skills ({len(gap)}):*")
+                    st.markdown(f"*Gap Skills ({len(gap)}), most valuable first:*")
                     if gap:
-                        for skill in sorted(gap):
+                        for skill, market in predictor.rank_gap_skills(gap, domain):
                             skill_title = skill.title()
                             search_url = f"https://www.google.com/search?q=learn+{skill.replace(' ', '+')}+online"
                             st.markdown(f"- 🔺 {skill_title} → [Upskill Link]({search_url})")
+                            if market is not None:
+                                salary = f"median ${market['salary']['p50'] / 1000:,.0f}k · " if market["salary"] else ""
+                                st.caption(f"{salary}{market['demand']['high']:.0%} high demand · "
+                                           f"{market['postings']} postings")
                     else:
                         st.success("You're well-matched for this role!")
 
-        # --------- Downloadable Reports (implement your functions) --------- #
-        # Add a Generate PDF button in the sidebar
-        with st.sidebar:
-            generate_pdf_btn = st.button(" Generate & Download PDF Report")
+        # ------------ Best Matching Job Postings ---------------- #
+        st.markdown("### Best Matching Job Postings")
+        posting_index = get_posting_index()
+        choices = posting_index.filter_values()
+        filter_cols = st.columns(3)
+        with filter_cols[0]:
+            domain_filter = st.multiselect("Domain", choices["domain"])
+        with filter_cols[1]:
+            demand_filter = st.multiselect("Demand Level", choices["demand"])
+        with filter_cols[2]:
+            qualification_filter = st.multiselect("Qualification", choices["qualification"])
 
-        # Generate & show download button only if user clicks
-        if generate_pdf_btn:
-            with st.spinner("Generating PDF report..."):
-                pdf_report_path = os.path.join(tempfile.gettempdir(), "skillfit_report.pdf")
-                generate_pdf_report(pdf_report_path, extracted_skills, top_5, gap_info_list)
-
-            if os.path.exists(pdf_report_path) and os.path.getsize(pdf_report_path) > 0:
-                with open(pdf_report_path, "rb") as file:
-                    st.sidebar.download_button(
-                        label="⬇ Download PDF Report",
-                        data=file,
-                        file_name="skillfit_report.pdf",
-                        mime="application/pdf",
+        with metrics.span("posting_search"):
+            postings = posting_index.search(
+                extracted_skills, k=10,
+                domain=domain_filter, demand=demand_filter, qualification=qualification_filter,
+            )
+        if postings:
+            for posting in postings:
+                with st.expander(f"{posting['title']} | {posting['domain']} — {int(posting['score'] * 100)}% match"):
+                    st.markdown(
+                        f"*Qualification:* {posting['qualification']} &nbsp;|&nbsp; "
+                        f"*Demand:* {posting['demand']} &nbsp;|&nbsp; *Salary:* {posting['salary']}"
                     )
+                    st.markdown(f"*Matched Skills ({len(posting['matched'])}):* "
+                                + ", ".join(s.title() for s in posting['matched']))
+                    st.markdown(f"*Missing Skills ({len(posting['missing'])}):* "
+                                + (", ".join(s.title() for s in posting['missing']) or "None"))
+        else:
+            st.info("No postings match your skills with these filters.")
+
+        # --------- Downloadable Reports --------- #
+        # Rendering was queued on the work pool when the button was clicked;
+        # pick the result up now that the rest of the page is drawn.
+        if report_job is not None:
+            busy = None
+            with report_slot, st.spinner("Generating PDF report..."):
+                try:
+                    pdf_report = report_job[1].result()
+                except Busy as e:
+                    pdf_report, busy = None, e
+
+            if busy is not None:
+                del st.session_state["pdf_report_job"]
+                report_slot.warning(f"⚠ Too busy to build the report now. Please retry in about {busy.retry_after}s.")
+            elif pdf_report:
+                report_slot.download_button(
+                    label="⬇ Download PDF Report",
+                    data=pdf_report,
+                    file_name="skillfit_report.pdf",
+                    mime="application/pdf",
+                )
             else:
-                st.sidebar.error("⚠ PDF report generation failed.")
+                del st.session_state["pdf_report_job"]
+                report_slot.error("⚠ PDF report generation failed.")
 
         # col_dl1, col_dl2 = st.columns(2)
         # with col_dl1:
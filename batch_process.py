@@ -0,0 +1,286 @@
+# batch_process.py
+# Batch resume screening from the command line.
+#
+#   python batch_process.py resumes/ -o results.jsonl
+#   python batch_process.py manifest.txt -o results.csv --workers 8 --resume
+#
+# Each file goes through extract_skills_with_exact_match -> predict_top_roles_domains
+# -> get_gap_skills in a process pool. Results are appended to the output as
+# each file finishes, so a rerun with --resume skips every file already written
+# with status "ok" (and retries the errors). If a PDF crashes its worker
+# process, the files in flight with it are rerun one by one, so only the
+# culprit is recorded as an error.
+#
+# On Linux the model and skill matchers are loaded once in the parent and the
+# workers are forked from it, so they share those pages copy-on-write.
+# Loading in each worker would give every process its own copy of the forest:
+# sklearn copies tree arrays out of a memory map.
+import argparse
+import concurrent.futures as cf
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.json")
+STAGES = ("extract", "predict", "gap", "report")
+CSV_FIELDS = ["file", "status", "skills", "top_roles", "gap_skills", "error"]
+
+
+# ---------------------- INPUT ----------------------
+def iter_input_files(source):
+    # A directory is scanned recursively for PDFs; anything else is a manifest
+    # with one path per line (relative paths resolve against the manifest).
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    yield os.path.join(root, name)
+        return
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            path = line.strip()
+            if path and not path.startswith("#"):
+                yield path if os.path.isabs(path) else os.path.join(base, path)
+
+
+# ---------------------- WORKER ----------------------
+_worker = {}
+
+def init_worker(skills_path, reports_dir=None):
+    # Loaded once per process, not once per file.
+    from extractor.Skill_extractor import extract_skills_with_exact_match
+    from domainn_predictor import predict_top_roles_domains, get_gap_skills_for_predictions
+    from export_pdf import render_pdf_report
+
+    _worker["extract"] = extract_skills_with_exact_match
+    _worker["predict"] = predict_top_roles_domains
+    _worker["gaps"] = get_gap_skills_for_predictions
+    _worker["report"] = render_pdf_report
+    _worker["skills_path"] = skills_path
+    _worker["reports_dir"] = reports_dir
+
+def preload(skills_path, reports_dir=None):
+    # Everything init_worker needs, loaded in the parent before any pool
+    # forks: the workers' own init_worker then finds it all in sys.modules.
+    init_worker(skills_path, reports_dir)
+    from extractor.Skill_extractor import find_skills_in_text
+    find_skills_in_text("", skills_path)      # builds the exact and fuzzy matchers
+
+def report_path(reports_dir, path):
+    # Name after the resume, plus a short hash so equal names in different folders don't clash.
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(reports_dir, f"{stem}-{digest}.pdf")
+
+def result_fields(skills, predictions, gaps):
+    # JSON-friendly analysis result; also the response body of inference_service.
+    return {
+        "skills": skills,
+        "predictions": [
+            {"role": role, "domain": domain, "score": round(float(score), 4)}
+            for role, domain, score in predictions
+        ],
+        "gaps": [
+            {"role": role, "domain": domain, "required": sorted(required), "gap": sorted(gap)}
+            for (role, domain, _), (_, required, gap) in zip(predictions, gaps)
+        ],
+    }
+
+def process_file(path, top_n=5, gap_n=3):
+    record = {"file": path}
+    timings = {}
+    try:
+        t0 = time.perf_counter()
+        skills = _worker["extract"](path, _worker["skills_path"])
+        t1 = time.perf_counter()
+        predictions = _worker["predict"](skills, top_n=top_n) if skills else []
+        t2 = time.perf_counter()
+        gaps = _worker["gaps"](skills, predictions, gap_n) if skills else []
+        t3 = time.perf_counter()
+        timings = {"extract": t1 - t0, "predict": t2 - t1, "gap": t3 - t2}
+
+        if _worker["reports_dir"] and skills:
+            pdf_bytes = _worker["report"](skills, predictions, gaps)
+            if pdf_bytes is None:
+                raise RuntimeError("PDF report generation failed")
+            record["report"] = report_path(_worker["reports_dir"], path)
+            with open(record["report"], "wb") as f:
+                f.write(pdf_bytes)
+            timings["report"] = time.perf_counter() - t3
+
+        record["status"] = "ok"
+        record.update(result_fields(skills, predictions, gaps))
+    except Exception as e:
+        # One bad PDF must not take the run down with it.
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["timings"] = timings
+    return record
+
+
+# ---------------------- OUTPUT ----------------------
+def output_format(path):
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def load_done(path):
+    # Files a previous (possibly interrupted) run finished; error rows are retried.
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if output_format(path) == "csv":
+            for row in csv.DictReader(f):
+                if row["status"] == "ok":
+                    done.add(row["file"])
+        else:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record["status"] == "ok":
+                        done.add(record["file"])
+                except (ValueError, KeyError):
+                    continue  # torn last line from a killed run
+    return done
+
+class ResultWriter:
+    def __init__(self, path, append):
+        self.format = output_format(path)
+        new_file = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self.f = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        if self.format == "csv":
+            self.csv = csv.DictWriter(self.f, fieldnames=CSV_FIELDS)
+            if new_file:
+                self.csv.writeheader()
+
+    def write(self, record):
+        if self.format == "csv":
+            self.csv.writerow({
+                "file": record["file"],
+                "status": record["status"],
+                "skills": "; ".join(record.get("skills", [])),
+                "top_roles": "; ".join(f"{p['role']} | {p['domain']} ({p['score']:.2f})" for p in record.get("predictions", [])),
+                "gap_skills": " || ".join("; ".join(g["gap"]) for g in record.get("gaps", [])),
+                "error": record.get("error", ""),
+            })
+        else:
+            self.f.write(json.dumps(record) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+# ---------------------- RUN ----------------------
+# fork on Linux, so workers inherit what preload() loaded. Elsewhere fork is
+# unsafe with the system libraries, and each worker loads its own copy.
+POOL_CONTEXT = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+
+def new_pool(workers, skills_path, reports_dir):
+    return cf.ProcessPoolExecutor(workers, mp_context=POOL_CONTEXT,
+                                  initializer=init_worker, initargs=(skills_path, reports_dir))
+
+def run_isolated(paths, record_result, skills_path, top_n, gap_n, reports_dir):
+    # Files that were in flight when a worker died, one at a time in a
+    # single-worker pool: only the file that kills the worker again is
+    # recorded as an error, the innocent ones get their normal result.
+    remaining = list(paths)
+    while remaining:
+        with new_pool(1, skills_path, reports_dir) as solo:
+            try:
+                while remaining:
+                    record_result(solo.submit(process_file, remaining[0], top_n, gap_n).result())
+                    remaining.pop(0)
+            except BrokenProcessPool as e:
+                record_result({"file": remaining.pop(0), "status": "error",
+                               "error": f"worker crashed: BrokenProcessPool: {e}", "timings": {}})
+
+def run(files, writer, workers, skills_path, top_n=5, gap_n=3, max_in_flight=None, reports_dir=None):
+    max_in_flight = max_in_flight or workers * 4
+    stats = {"ok": 0, "error": 0, "timings": {stage: 0.0 for stage in STAGES}}
+    pending = iter(files)
+
+    def record_result(record):
+        stats[record["status"]] += 1
+        for stage, seconds in record.get("timings", {}).items():
+            stats["timings"][stage] += seconds
+        writer.write(record)
+
+    exhausted = False
+    while not exhausted:
+        # Recreated only if a worker dies hard (e.g. a segfault inside MuPDF).
+        suspects = []
+        with new_pool(workers, skills_path, reports_dir) as pool:
+            in_flight = {}
+            try:
+                while True:
+                    # Keep a bounded window of submitted files so memory stays flat.
+                    while len(in_flight) < max_in_flight:
+                        path = next(pending, None)
+                        if path is None:
+                            break
+                        in_flight[pool.submit(process_file, path, top_n, gap_n)] = path
+                    if not in_flight:
+                        exhausted = True
+                        break
+                    done, _ = cf.wait(in_flight, return_when=cf.FIRST_COMPLETED)
+                    for future in done:
+                        path = in_flight.pop(future)
+                        try:
+                            record_result(future.result())
+                        except BrokenProcessPool:
+                            in_flight[future] = path
+                            raise
+            except BrokenProcessPool:
+                suspects = list(in_flight.values())
+        if suspects:
+            run_isolated(suspects, record_result, skills_path, top_n, gap_n, reports_dir)
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch skill extraction, role prediction and gap analysis for resume PDFs.")
+    parser.add_argument("source", help="directory of PDFs or a manifest file with one path per line")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="output file (.jsonl or .csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--skills", default=SKILLS_PATH, help="skills vocabulary JSON")
+    parser.add_argument("--top-n", type=int, default=5, help="number of role/domain predictions per file")
+    parser.add_argument("--gap-n", type=int, default=3, help="number of top predictions to run gap analysis for")
+    parser.add_argument("--reports-dir", help="also write a PDF report per resume into this directory")
+    parser.add_argument("--resume", action="store_true", help="skip files already in the output and append to it")
+    args = parser.parse_args(argv)
+
+    done = load_done(args.output) if args.resume else set()
+    files = (path for path in iter_input_files(args.source) if path not in done)
+    if done:
+        print(f"Resuming: {len(done)} files already processed.")
+
+    if args.reports_dir:
+        os.makedirs(args.reports_dir, exist_ok=True)
+    writer = ResultWriter(args.output, append=args.resume)
+    start = time.perf_counter()
+    if POOL_CONTEXT is not None:
+        preload(args.skills, args.reports_dir)
+    try:
+        stats = run(files, writer, args.workers, args.skills, args.top_n, args.gap_n, reports_dir=args.reports_dir)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    total = stats["ok"] + stats["error"]
+    print(f"Processed {total} files ({stats['ok']} ok, {stats['error']} errors) in {elapsed:.2f}s "
+          f"-> {total / elapsed if elapsed else 0.0:.2f} files/sec with {args.workers} workers")
+    for stage in STAGES:
+        seconds = stats["timings"][stage]
+        print(f"  {stage:<8} total {seconds:8.3f}s   mean {seconds / total * 1000 if total else 0.0:8.2f} ms/file")
+    return 0 if stats["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
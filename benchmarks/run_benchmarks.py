@@ -0,0 +1,228 @@
+# benchmarks/run_benchmarks.py
+# Reproducible offline benchmarks for the SkillFit pipeline.
+#
+#   python benchmarks/run_benchmarks.py                                  # writes benchmarks/results.json
+#   python benchmarks/run_benchmarks.py --output base.json               # store a baseline
+#   python benchmarks/run_benchmarks.py --compare base.json              # flag regressions against it
+#
+# Synthetic resume PDFs are generated from rows of final_synthetic_job_postings.csv
+# with a fixed seed, so two runs on the same machine time the same inputs.
+import argparse
+import ast
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+POSTINGS_PATH = os.path.join(ROOT, "final_synthetic_job_postings.csv")
+SKILLS_PATH = os.path.join(ROOT, "skills.json")
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results.json")
+IMPORT_MODULES = ["extractor.Skill_extractor", "domainn_predictor", "export_pdf"]
+
+FILLER = (
+    "Worked with cross-functional teams to deliver projects on time and within budget. "
+    "Responsible for planning, documentation, stakeholder communication and reporting. "
+)
+
+
+# ---------------------- SYNTHETIC INPUTS ----------------------
+def load_postings(n, seed):
+    with open(POSTINGS_PATH, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    rng = random.Random(seed)
+    return rng.sample(rows, min(n, len(rows)))
+
+def write_resume_pdf(path, postings, pages):
+    import fitz
+
+    doc = fitz.open()
+    for page_no in range(pages):
+        posting = postings[page_no % len(postings)]
+        skills = ast.literal_eval(posting["Required Skills"])
+        body = (
+            f"{posting['Job Title']} - {posting['Domain']}\n\n"
+            f"Qualification: {posting['Qualification']}\n"
+            f"Skills: {' | '.join(skills)}\n\n" + FILLER * 12
+        )
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 545, 790), body, fontsize=10)
+    doc.save(path)
+    doc.close()
+
+def make_corpus(workdir, page_counts, docs_per_size, seed):
+    corpus = {}
+    postings = load_postings(max(page_counts) * docs_per_size, seed)
+    for pages in page_counts:
+        paths = []
+        for i in range(docs_per_size):
+            path = os.path.join(workdir, f"resume_{pages}p_{i}.pdf")
+            start = (i * pages) % len(postings)
+            write_resume_pdf(path, postings[start:start + pages] or postings, pages)
+            paths.append(path)
+        corpus[pages] = paths
+    return corpus
+
+
+# ---------------------- MEASUREMENT ----------------------
+def time_calls(fn, args_list, repeat):
+    # Per-call timings over `repeat` passes of every input.
+    samples = []
+    for _ in range(repeat):
+        for args in args_list:
+            t0 = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "min_ms": samples[0] * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+    }
+
+def peak_memory_mb(fn, args_list):
+    # Separate pass: tracemalloc slows allocation-heavy code down a lot.
+    tracemalloc.start()
+    try:
+        for args in args_list:
+            fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+def measure(fn, args_list, repeat):
+    result = time_calls(fn, args_list, repeat)
+    result["peak_python_mb"] = peak_memory_mb(fn, args_list[:1])
+    return result
+
+def import_times(repeat):
+    # Fresh interpreter per sample so nothing is already in sys.modules.
+    times = {}
+    for module in IMPORT_MODULES:
+        code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+        samples = []
+        for _ in range(repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()
+            samples.append(float(out[-1]))
+        times[module] = {"min_s": min(samples), "median_s": statistics.median(samples)}
+    return times
+
+
+# ---------------------- SUITE ----------------------
+def run_suite(page_counts, docs_per_size, repeat, seed, import_repeat):
+    from extractor.Skill_extractor import extract_text_from_pdf, extract_skills_with_exact_match
+    from domainn_predictor import predict_top_roles_domains, predict_top_roles_domains_batch, get_gap_skills
+    from export_pdf import render_pdf_report
+
+    def gaps_for(skills, top_5):
+        return [get_gap_skills(skills, role, domain) for role, domain, _ in top_5[:3]]
+
+    def end_to_end(path):
+        skills = extract_skills_with_exact_match(path, SKILLS_PATH)
+        top_5 = predict_top_roles_domains(skills)
+        render_pdf_report(skills, top_5, gaps_for(skills, top_5))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus = make_corpus(workdir, page_counts, docs_per_size, seed)
+        for pages, paths in corpus.items():
+            docs = [(p,) for p in paths]
+            skills = [extract_skills_with_exact_match(p, SKILLS_PATH) for p in paths]
+            top_5s = [predict_top_roles_domains(s) for s in skills]
+            gaps = [gaps_for(s, t) for s, t in zip(skills, top_5s)]
+
+            results[f"{pages}p"] = {
+                "extract_text_from_pdf": measure(extract_text_from_pdf, docs, repeat),
+                "extract_skills_with_exact_match": measure(
+                    extract_skills_with_exact_match, [(p, SKILLS_PATH) for p in paths], repeat
+                ),
+                "predict_top_roles_domains": measure(predict_top_roles_domains, [(s,) for s in skills], repeat),
+                "predict_top_roles_domains_batch": measure(predict_top_roles_domains_batch, [(skills,)], repeat),
+                "get_gap_skills": measure(gaps_for, list(zip(skills, top_5s)), repeat),
+                "generate_pdf_report": measure(render_pdf_report, list(zip(skills, top_5s, gaps)), repeat),
+                "end_to_end": measure(end_to_end, docs, repeat),
+                "skills_found_mean": statistics.fmean(len(s) for s in skills),
+            }
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {"page_counts": page_counts, "docs_per_size": docs_per_size, "repeat": repeat, "seed": seed},
+        },
+        "import_time": import_times(import_repeat),
+        "stages": results,
+    }
+
+
+# ---------------------- COMPARE ----------------------
+def iter_metrics(results):
+    # (name, value) pairs that are "lower is better" timings / memory.
+    for module, t in results.get("import_time", {}).items():
+        yield f"import_time.{module}.min_s", t["min_s"]
+    for size, stages in results.get("stages", {}).items():
+        for stage, m in stages.items():
+            if isinstance(m, dict):
+                yield f"{size}.{stage}.median_ms", m["median_ms"]
+                yield f"{size}.{stage}.peak_python_mb", m["peak_python_mb"]
+
+def compare(current, baseline, threshold):
+    base = dict(iter_metrics(baseline))
+    regressions = []
+    print(f"{'metric':<62}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, value in iter_metrics(current):
+        if name not in base or base[name] <= 0:
+            continue
+        change = value / base[name] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<62}{base[name]:>12.3f}{value:>12.3f}{change:>+9.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction, prediction, gap analysis and report generation.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20], help="page counts of the synthetic resumes")
+    parser.add_argument("--docs", type=int, default=5, help="synthetic resumes per page count")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--import-repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.pages, args.docs, args.repeat, args.seed, args.import_repeat)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# compare_backends.py
+# Accuracy / latency / size comparison of the inference backends on a
+# held-out split of final.csv (the same 80/20 split the builder uses).
+#
+#   python compare_backends.py
+#   python compare_backends.py --backends forest linear --json backend_report.json
+import argparse
+import io
+import json
+import time
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from inference_backends import BACKENDS, make_backend
+from model_artifacts import DATASET_PATH, load_training_data
+
+
+def top_k_accuracy(probs, classes, y_true, k):
+    # probs columns follow `classes`, which may be a subset of all labels.
+    top = np.argsort(-probs, axis=1, kind="stable")[:, :k]
+    return float(np.mean([y in classes[row] for y, row in zip(y_true, top)]))
+
+def serialized(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.getvalue()
+
+def evaluate_backend(name, vectorizer, X_train, y_train, test_strs, y_test, latency_samples=300):
+    model = make_backend(name)
+    t0 = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - t0
+
+    # Single-request latency: transform + predict_proba for one profile,
+    # which is what the app does per upload.
+    latencies = []
+    for text in test_strs[:latency_samples]:
+        t0 = time.perf_counter()
+        model.predict_proba(vectorizer.transform([text]))
+        latencies.append(time.perf_counter() - t0)
+
+    # Batch throughput: the whole test set in one call.
+    t0 = time.perf_counter()
+    probs = model.predict_proba(vectorizer.transform(test_strs))
+    batch_seconds = time.perf_counter() - t0
+
+    blob = serialized(model)
+    t0 = time.perf_counter()
+    joblib.load(io.BytesIO(blob))
+    load_seconds = time.perf_counter() - t0
+
+    return {
+        "backend": name,
+        "top1_accuracy": top_k_accuracy(probs, model.classes_, y_test, 1),
+        "top5_accuracy": top_k_accuracy(probs, model.classes_, y_test, 5),
+        "p50_latency_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_latency_ms": float(np.percentile(latencies, 99) * 1000),
+        "batch_rows_per_sec": len(test_strs) / batch_seconds,
+        "model_size_mb": len(blob) / 1e6,
+        "load_seconds": load_seconds,
+        "fit_seconds": fit_seconds,
+    }
+
+def compare(backends, dataset_path=DATASET_PATH):
+    df = load_training_data(dataset_path)
+    y = LabelEncoder().fit_transform(df['Combined_Label'])
+    train_strs, test_strs, y_train, y_test = train_test_split(
+        df['Skills_str'].tolist(), y, test_size=0.2, random_state=42
+    )
+    vectorizer = TfidfVectorizer(ngram_range=(1, 3))
+    X_train = vectorizer.fit_transform(train_strs)
+    return [evaluate_backend(name, vectorizer, X_train, y_train, test_strs, y_test) for name in backends]
+
+def print_report(rows):
+    header = f"{'backend':<10}{'top1':>7}{'top5':>7}{'p50 ms':>9}{'p99 ms':>9}{'rows/s':>10}{'size MB':>9}{'load s':>8}{'fit s':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['backend']:<10}{r['top1_accuracy']:>7.3f}{r['top5_accuracy']:>7.3f}"
+              f"{r['p50_latency_ms']:>9.2f}{r['p99_latency_ms']:>9.2f}{r['batch_rows_per_sec']:>10.0f}"
+              f"{r['model_size_mb']:>9.2f}{r['load_seconds']:>8.3f}{r['fit_seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare role/domain inference backends on a held-out split.")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    rows = compare(args.backends, args.dataset)
+    print_report(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
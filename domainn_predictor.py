@@ -1,126 +1,195 @@
 # ---------------------- IMPORTS ----------------------
-import pandas as pd
+import os
+import threading
+import time
+from collections import namedtuple
+
 import numpy as np
-import ast
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report
-from sklearn.utils.multiclass import unique_labels
-
-# ---------------------- SKILL NORMALIZATION ----------------------
-skill_mapping = {
-    "ml": "machine learning", "dl": "deep learning", "ai": "artificial intelligence",
-    "rest api": "rest api", "rest apis": "rest api", "restful api": "rest api",
-    "restful": "rest api", "rest": "rest api", "springboot": "spring boot",
-    "spring-boot": "spring boot", "apis": "api", "large language models": "llms",
-    "large language model": "llms", "llm": "llms", "natural language understanding": "natural language processing",
-    "natural language generation": "natural language processing", "nlp": "natural language processing",
-    "Natural language processing": "natural language processing", "viz": "visualization",
-    "data viz": "data visualization", "tensorflow 2.0": "tensorflow", "py": "python",
-    "react": "react", "react js": "react", "react.js": "react", "js": "javascript",
-    "c plus plus": "c++", "cpp": "c++", "csharp": "c#", "rdbms": "relational database",
-    "sql server": "sql", "postgressql": "postgresql", "nosql db": "nosql",
-    "xgboost": "gradient boosting", "gboost": "gradient boosting", "pytorch": "deep learning",
-    "prompting": "prompt engineering", "prompt": "prompt engineering", "AI prompt": "prompt engineering",
-    "AI prompting": "prompt engineering", "convolutional neural network": "cnn",
-    "convolutional neural networks": "cnn", "convolutional neural net": "cnn",
-    "convolutional neural nets": "cnn", "recurrent neural network": "rnn",
-    "recurrent neural networks": "rnn", "recurrent neural net": "rnn",
-    "recurrent neural nets": "rnn", "long short term memory": "lstm",
-    "long short term memory networks": "lstm", "long short term memory net": "lstm",
-    "Genarative adversarial networks": "gans", "Generative adversarial network": "gans",
-    "ML pipeline": "ml pipelines", "MLpipeline": "ml pipelines", "MLOps": "ml ops",
-    "stats": "statistics", "stat": "statistics", "maths": "mathematics", "math": "mathematics",
-    "algorithm": "algorithms", "Data structures": "data structures", "Data structure": "data structures",
-    "DSA": "dsa", "System designing": "system design", "System design": "system design",
-    "Oops": "oop", "Object oriented programming": "oop", "Object oriented programming language": "oop"
-}
-
-def normalize_skills_list(skill_list):
-    normalized = []
-    for skill in skill_list:
-        skill = skill.lower().strip().replace('_', ' ')
-        normalized_skill = skill_mapping.get(skill, skill)
-        normalized.append(normalized_skill)
-    return normalized
-
-# ---------------------- LOAD DATA ----------------------
-dataset_path = "final.csv"
-df = pd.read_csv(dataset_path)
-
-# Remove duplicates
-df.drop_duplicates(inplace=True)
-
-# Convert stringified list to actual list and normalize each skill
-df['Skills'] = df['Skills'].apply(ast.literal_eval)
-df['Skills'] = df['Skills'].apply(normalize_skills_list)
-
-# Join normalized list back to space-separated string for vectorizer
-df['Skills_str'] = df['Skills'].apply(lambda x: ' '.join(x))
-
-# ---------------------- LABEL ENCODING ----------------------
-df['Combined_Label'] = df['Role'].str.strip() + " || " + df['Domain'].str.strip()
-le_combined = LabelEncoder()
-df['Combined_encoded'] = le_combined.fit_transform(df['Combined_Label'])
-
-# ---------------------- VECTORIZATION ----------------------
-vectorizer = TfidfVectorizer(ngram_range=(1, 3))
-X = vectorizer.fit_transform(df['Skills_str'])
-y_combined = df['Combined_encoded']
-
-# ---------------------- TRAIN-TEST SPLIT ----------------------
-X_train, X_test, y_train, y_test = train_test_split(X, y_combined, test_size=0.2, random_state=42)
-
-# ---------------------- MODEL TRAINING ----------------------
-model = RandomForestClassifier(n_estimators=150, random_state=42)
-model.fit(X_train, y_train)
-
-# ---------------------- EVALUATION ----------------------
-y_pred = model.predict(X_test)
-labels_in_test = unique_labels(y_test, y_pred)
-target_names = le_combined.inverse_transform(labels_in_test)
-print(classification_report(y_test, y_pred, labels=labels_in_test, target_names=target_names))
+import metrics
+from skill_normalization import normalize_skills_list
+from model_artifacts import current_build_dir, load_artifacts, load_or_train
+from inference_backends import backend_from_env
+import skill_market
+
+# ---------------------- LOAD MODEL ----------------------
+# Prebuilt artifacts come from `python model_artifacts.py`; we only train here
+# when they are missing or were built from a different final.csv.
+# SKILLFIT_BACKEND picks the classifier (forest / linear / centroid / incremental).
+backend = backend_from_env()
+
+# Everything one prediction needs, swapped as a unit so a request never mixes
+# two builds. Predictions read `_live` once and use that snapshot throughout.
+LiveModel = namedtuple("LiveModel", "build_id vectorizer model gap_index class_roles class_domains")
+
+def _activate(artifacts):
+    global vectorizer, model, le_combined, gap_index, model_version, class_labels, class_roles, class_domains, _live
+    vectorizer = artifacts["vectorizer"]
+    model = artifacts["model"]
+    le_combined = artifacts["label_encoder"]
+    gap_index = artifacts["gap_index"]
+    # None when the model was trained here but could not be saved.
+    build_id = artifacts["manifest"]["build_id"] if artifacts["manifest"] else None
+    # Identifies the model behind a result (e.g. for result caching).
+    model_version = f"{backend}-{build_id or 'unsaved'}"
+
+    # Column of predict_proba -> (role, domain), resolved once instead of an
+    # inverse_transform per prediction.
+    class_labels = [label.split(" || ") for label in le_combined.inverse_transform(model.classes_)]
+    class_roles = np.array([role for role, _ in class_labels], dtype=object)
+    class_domains = np.array([domain for _, domain in class_labels], dtype=object)
+    _live = LiveModel(build_id, vectorizer, model, gap_index, class_roles, class_domains)
+
+_activate(load_or_train(backend=backend))
+
+# ---------------------- HOT SWAP ----------------------
+# A new build (model_artifacts.py or incremental_training.py) is picked up
+# without a restart: once a long-running process calls start_watcher(), a
+# daemon thread polls the backend's CURRENT pointer every
+# SKILLFIT_RELOAD_INTERVAL seconds (0 turns it off) and loads the new build
+# off the request path before swapping it in.
+RELOAD_INTERVAL = float(os.environ.get("SKILLFIT_RELOAD_INTERVAL", "30"))
+_reload_lock = threading.Lock()
+_watcher = None
+
+def reload_if_updated():
+    """Swap to the backend's current build if it changed; True if it did."""
+    with _reload_lock:
+        build_dir = current_build_dir(backend=backend)
+        if build_dir is None or os.path.basename(build_dir) == _live.build_id:
+            return False
+        artifacts = load_artifacts(backend=backend)
+        if artifacts is None:   # stale for this final.csv; keep serving what we have
+            return False
+        _activate(artifacts)
+    metrics.inc("model_reloads_total", help_text="Builds hot-swapped in without a restart")
+    print(f"Switched to model {model_version}")
+    return True
+
+def _watch_for_updates(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            reload_if_updated()
+            reload_market_if_updated()
+        except Exception as e:
+            print(f"Model reload failed: {e}")
+
+# ---------------------- SKILL MARKET ----------------------
+# Demand / salary table built from the job postings (skill_market.py), used
+# to rank gap skills by market value. Loaded on first use; None when there is
+# no postings dataset. Re-ingested tables are picked up by the same watcher.
+_market = None
+_market_loaded = False
+_market_lock = threading.Lock()
+
+def get_skill_market():
+    global _market, _market_loaded
+    with _market_lock:
+        if not _market_loaded:
+            _market = skill_market.open_market()
+            _market_loaded = True
+        return _market
+
+def reload_market_if_updated():
+    global _market
+    with _market_lock:
+        if not _market_loaded:
+            return False
+        build_dir = skill_market.current_market_dir(skill_market.market_path())
+        if build_dir is None or (_market is not None and os.path.basename(build_dir) == _market.build_id):
+            return False
+        market, _ = skill_market.load_market(skill_market.market_path())
+        if market is None:
+            return False
+        _market = market
+    return True
+
+def start_watcher(interval=RELOAD_INTERVAL):
+    """
+    Start the hot-swap thread (once per process); True if it is running.
+    Not started for a model that could not be saved: there is no build to
+    compare against, and every check would re-hash final.csv.
+    """
+    global _watcher
+    with _reload_lock:
+        if _watcher is None and interval > 0 and _live.build_id is not None:
+            _watcher = threading.Thread(target=_watch_for_updates, args=(interval,), daemon=True, name="model-reload")
+            _watcher.start()
+        return _watcher is not None
 
 # ---------------------- INFERENCE & GAP SKILL ANALYSIS ----------------------
 
 def predict_top_roles_domains(user_skills, top_n=5):
-    # Normalize and join for prediction
-    normalized_skills = normalize_skills_list(user_skills)
-    input_str = ' '.join(normalized_skills)
-    input_vector = vectorizer.transform([input_str])
+    return predict_top_roles_domains_batch([user_skills], top_n=top_n)[0]
 
-    # Predict probabilities
-    probs = model.predict_proba(input_vector)[0]
-    top_indices = np.argsort(probs)[-top_n:][::-1]
+def predict_top_roles_domains_batch(skill_lists, top_n=5, batch_size=4096):
+    # Normalize and join for prediction
+    live = _live
+    input_strs = [' '.join(normalize_skills_list(skills)) for skills in skill_lists]
+    top_n = min(top_n, len(live.class_roles))
+    if top_n <= 0:
+        return [[] for _ in skill_lists]
 
     predictions = []
-    for idx in top_indices:
-        combined_label = le_combined.inverse_transform([idx])[0]
-        role, domain = combined_label.split(" || ")
-        predictions.append((role, domain, probs[idx]))
+    for start in range(0, len(input_strs), batch_size):
+        # One sparse matrix and one predict_proba call per chunk
+        with metrics.span("tfidf_transform"):
+            input_matrix = live.vectorizer.transform(input_strs[start:start + batch_size])
+        with metrics.span("predict_proba"):
+            probs = live.model.predict_proba(input_matrix)
+        metrics.observe("predict_batch_rows", input_matrix.shape[0], "Profiles per predict_proba call")
+
+        # Top-k per row without sorting every class, then order just those k.
+        # Ties are common (forest probabilities are multiples of 1/n_trees), so
+        # the k-th score is found by partitioning and ties at that cut-off are
+        # resolved by label order to keep results deterministic.
+        kth = -np.partition(-probs, top_n - 1, axis=1)[:, top_n - 1:top_n]
+        above = probs > kth
+        at_cut = probs == kth
+        room = top_n - above.sum(axis=1, keepdims=True)
+        selected = above | (at_cut & (np.cumsum(at_cut, axis=1) <= room))
+        top = np.nonzero(selected)[1].reshape(-1, top_n)
+        top_probs = np.take_along_axis(probs, top, axis=1)
+        order = np.lexsort((top, -top_probs), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_probs = np.take_along_axis(top_probs, order, axis=1)
+
+        roles = live.class_roles[top]
+        domains = live.class_domains[top]
+        for row in range(len(top)):
+            predictions.append(list(zip(roles[row], domains[row], top_probs[row])))
     return predictions
 
 def get_gap_skills(user_skills, role, domain):
     user_set = set(normalize_skills_list(user_skills))
+    with metrics.span("gap_analysis"):
+        return _live.gap_index.gap(user_set, role, domain)
 
-    # Filter matching role+domain rows
-    filtered = df[(df['Role'].str.lower() == role.lower()) & (df['Domain'].str.lower() == domain.lower())]
-    if filtered.empty:
-        return user_set, set(), set()
-
-    required = set()
-    for skills in filtered['Skills']:
-        required.update(skills)
-
-    gap = required - user_set
-    return user_set, required, gap
+def get_gap_skills_for_predictions(user_skills, predictions, top_n=3):
+    # Gap analysis for the top-N predictions, encoding the user's skills once
+    user_set = set(normalize_skills_list(user_skills))
+    pairs = [(role, domain) for role, domain, _ in predictions[:top_n]]
+    with metrics.span("gap_analysis"):
+        return _live.gap_index.gaps_for(user_set, pairs)
+
+def rank_gap_skills(gap_skills, domain=None):
+    """
+    [(skill, market stats or None)] with the skills most worth learning
+    first: median salary, share of high-demand postings, posting count.
+    """
+    market = get_skill_market()
+    if market is None:
+        return [(skill, None) for skill in sorted(gap_skills)]
+    return market.rank(gap_skills, domain)
+
+def get_coverage_for_all_pairs(user_skills):
+    # (role, domain, n_required, n_overlap, n_gap, coverage) for every pair in the dataset
+    user_set = set(normalize_skills_list(user_skills))
+    return _live.gap_index.coverage_all(user_set)
 
 def analyze_gap_for_top_n(user_skills, predictions, top_n=3):
-    for i, (role, domain, score) in enumerate(predictions[:top_n], start=1):
-        user, required, gap = get_gap_skills(user_skills, role, domain)
+    gaps = get_gap_skills_for_predictions(user_skills, predictions, top_n)
+    for i, ((role, domain, score), (user, required, gap)) in enumerate(zip(predictions, gaps), start=1):
         print(f"Rank {i}: Role = {role} | Domain = {domain} | Confidence = {score:.3f}")
         print(f"Your Skills ({len(user)}): {sorted(user)}")
         print(f"Required Skills ({len(required)}): {sorted(required)}")
@@ -1,13 +1,111 @@
 import os
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 from fpdf import FPDF
 import tempfile
+import metrics
 
 
-def generate_pdf_report(pdf_path, extracted_skills, top_5, gap_info_list):
+CHART_BAR_COLOR = (0, 128, 128)   # teal, as in the original matplotlib chart
+CHART_GRID_COLOR = (210, 210, 210)
+
+
+def _fit_text(pdf, text, width):
+    # Trim a label with "..." so it fits in `width` at the current font.
+    if pdf.get_string_width(text) <= width:
+        return text
+    while text and pdf.get_string_width(text + "...") > width:
+        text = text[:-1]
+    return text + "..."
+
+
+def draw_match_chart(pdf, roles, scores):
+    """
+    Horizontal bar chart drawn with FPDF vector primitives: no figure, no PNG,
+    no temp file, and it stays sharp at any zoom.
+    """
+    left = pdf.l_margin
+    width = pdf.w - pdf.l_margin - pdf.r_margin
+    label_w = width * 0.42
+    plot_x = left + label_w + 2
+    plot_w = width - label_w - 14         # room for the "NN%" labels
+    bar_h, gap = 7, 3
+    plot_h = len(scores) * (bar_h + gap)
+
+    # Keep the chart on one page: positions below are absolute, so an
+    # automatic break mid-chart would scatter its cells over new pages.
+    if pdf.get_y() + 2 + plot_h + 10 > pdf.h - pdf.b_margin:
+        pdf.add_page()
+    auto_break, break_margin = pdf.auto_page_break, pdf.b_margin
+    pdf.set_auto_page_break(False)
+    top = pdf.get_y() + 2
+
+    # Gridlines and x-axis ticks every 20%
+    pdf.set_font("Arial", size=8)
+    pdf.set_draw_color(*CHART_GRID_COLOR)
+    pdf.set_line_width(0.2)
+    for tick in range(0, 101, 20):
+        x = plot_x + plot_w * tick / 100
+        pdf.line(x, top, x, top + plot_h)
+        pdf.set_xy(x - 5, top + plot_h + 1)
+        pdf.cell(10, 4, f"{tick}", align='C')
+    pdf.set_xy(plot_x, top + plot_h + 5)
+    pdf.cell(plot_w, 4, "Match %", align='C')
+
+    # Bars, highest match first
+    pdf.set_fill_color(*CHART_BAR_COLOR)
+    for i, (label, score) in enumerate(zip(roles, scores)):
+        y = top + i * (bar_h + gap) + gap / 2
+        pdf.set_xy(left, y)
+        pdf.cell(label_w, bar_h, _fit_text(pdf, label, label_w), align='R')
+        bar_w = plot_w * max(0, min(score, 100)) / 100
+        if bar_w > 0:
+            pdf.rect(plot_x, y, bar_w, bar_h, 'F')
+        pdf.set_xy(plot_x + bar_w + 1, y)
+        pdf.cell(12, bar_h, f"{score}%")
+
+    pdf.set_draw_color(0, 0, 0)
+    pdf.set_auto_page_break(auto_break, break_margin)
+    pdf.set_xy(left, top + plot_h + 10)
+
+
+def embed_matplotlib_chart(pdf, roles, scores):
+    # Raster fallback through matplotlib (imported only when used).
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
+        chart_path = tmp.name
+    try:
+        plt.figure(figsize=(10, 6))
+        # Horizontal bar chart
+        plt.barh(roles[::-1], scores[::-1], color='teal')
+        plt.xlabel('Match %')
+        plt.title('Match Percentage for Top Predicted Roles')
+        plt.xlim(0, 100)
+        # Add percentage labels
+        for i, v in enumerate(scores[::-1]):
+            plt.text(v + 1, i, f"{v}%")
+
+        plt.tight_layout()
+        plt.savefig(chart_path, dpi=150)
+        plt.close()
+
+        # PyFPDF 1.7 only embeds images from a path
+        pdf.image(chart_path, x=10, w=pdf.w - 20)
+        pdf.ln(10)
+    finally:
+        try:
+            os.unlink(chart_path)
+        except OSError:
+            pass
+
+
+def build_pdf_report(extracted_skills, top_5, gap_info_list, chart="vector"):
     """
-    Generate a PDF report with skill analysis and visualizations.
-    Uses matplotlib for reliable chart generation instead of Plotly.
+    Build the report document with skill analysis and visualizations.
+    chart="vector" draws the bar chart natively; chart="matplotlib" embeds a
+    rendered PNG instead.
     """
     # Create PDF object with default Latin-1 encoding (FPDF limitation)
     pdf = FPDF()
@@ -26,45 +124,23 @@ def generate_pdf_report(pdf_path, extracted_skills, top_5, gap_info_list):
     pdf.multi_cell(0, 8, ", ".join(sorted([s.title() for s in extracted_skills])))
     pdf.ln(5)
 
-    # Create chart with matplotlib (more reliable than Plotly for PDF embedding)
+    # Match percentage chart
     roles = [f"{role} | {domain}" for role, domain, _ in top_5]
     scores = [int(score * 100) for _, _, score in top_5]
-    
-    # Create temporary file for the chart
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-        chart_path = tmp.name
-        
-        try:
-            plt.figure(figsize=(10, 6))
-            # Horizontal bar chart
-            plt.barh(roles[::-1], scores[::-1], color='teal')
-            plt.xlabel('Match %')
-            plt.title('Match Percentage for Top Predicted Roles')
-            plt.xlim(0, 100)
-            # Add percentage labels
-            for i, v in enumerate(scores[::-1]):
-                plt.text(v + 1, i, f"{v}%")
-                
-            plt.tight_layout()
-            plt.savefig(chart_path, dpi=150)
-            plt.close()
-            
-            # Add image to PDF
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(0, 10, "Top Role Match Percentages:", ln=True)
-            pdf.image(chart_path, x=10, w=pdf.w - 20)
-            pdf.ln(10)
-            
-        except Exception as e:
-            # Fallback if image creation fails
-            pdf.cell(0, 10, f"Chart generation failed: {str(e)}", ln=True)
-            print(f"Chart error: {str(e)}")
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(chart_path)
-            except:
-                pass
+
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(0, 10, "Top Role Match Percentages:", ln=True)
+    try:
+        with metrics.span("report_chart"):
+            if chart == "matplotlib":
+                embed_matplotlib_chart(pdf, roles, scores)
+            else:
+                draw_match_chart(pdf, roles, scores)
+    except Exception as e:
+        # Fallback if chart creation fails
+        pdf.set_font("Arial", size=10)
+        pdf.cell(0, 10, f"Chart generation failed: {str(e)}", ln=True)
+        print(f"Chart error: {str(e)}")
 
     # Skill Gap Analysis
     pdf.set_font("Arial", 'B', 14)
@@ -94,11 +170,59 @@ def generate_pdf_report(pdf_path, extracted_skills, top_5, gap_info_list):
             pdf.cell(0, 7, "You're well-matched for this role!", ln=True)
         pdf.ln(5)
 
+    return pdf
+
+
+def pdf_to_bytes(pdf):
+    # PyFPDF 1.7 returns a latin-1 str for dest='S'; fpdf2 returns a bytearray.
+    data = pdf.output(dest='S')
+    return data.encode('latin-1') if isinstance(data, str) else bytes(data)
+
+
+def render_pdf_report(extracted_skills, top_5, gap_info_list, chart="vector"):
+    """
+    Render the report in memory and return the PDF bytes (None on failure),
+    ready to hand to st.download_button without touching the disk.
+    """
+    try:
+        with metrics.span("report_render"):
+            return pdf_to_bytes(build_pdf_report(extracted_skills, top_5, gap_info_list, chart))
+    except Exception as e:
+        print(f"Error rendering PDF: {str(e)}")
+        return None
+
+
+def _render_report_args(args):
+    return render_pdf_report(*args)
+
+
+def render_pdf_reports(analyses, workers=1, chart="vector"):
+    """
+    Render many reports; analyses is an iterable of
+    (extracted_skills, top_5, gap_info_list). Returns PDF bytes (or None)
+    in input order, fanning out over processes when workers > 1.
+    """
+    jobs = [(skills, top_5, gaps, chart) for skills, top_5, gaps in analyses]
+    if workers <= 1:
+        return [_render_report_args(job) for job in jobs]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_render_report_args, jobs, chunksize=16))
+
+
+def generate_pdf_report(pdf_path, extracted_skills, top_5, gap_info_list):
+    """
+    Generate a PDF report with skill analysis and visualizations and save it to pdf_path.
+    """
+    pdf_bytes = render_pdf_report(extracted_skills, top_5, gap_info_list)
+    if pdf_bytes is None:
+        return False
+
     # Save PDF
     try:
-        pdf.output(pdf_path)
+        with open(pdf_path, 'wb') as f:
+            f.write(pdf_bytes)
         print(f"PDF saved successfully to {pdf_path}")
         return True
     except Exception as e:
         print(f"Error saving PDF: {str(e)}")
-        return False
\ No newline at end of file
+        return False
@@ -3,19 +3,100 @@ import fitz  # PyMuPDF
 import json
 import re
 import os
+from concurrent.futures import ProcessPoolExecutor
+from extractor.skill_matcher import SkillMatcher
+from skill_normalization import FUZZY_THRESHOLD, FuzzySkillIndex, surface_forms
+import metrics
 
-def extract_text_from_pdf(pdf_path):
-    text = ""
-    doc = fitz.open(pdf_path)
-    for page in doc:
-        text += page.get_text()
-    return text
+# Documents with at least this many pages are split across processes when
+# workers > 1; below it the process start-up costs more than it saves.
+PARALLEL_MIN_PAGES = 16
+
+def open_pdf(source):
+    # Path, raw bytes or an already opened document -> (doc, opened_here)
+    if isinstance(source, fitz.Document):
+        return source, False
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(source), filetype="pdf"), True
+    return fitz.open(source), True
+
+def _extract_page_range(source, start, stop):
+    # Runs in a worker process: each one opens its own copy of the document.
+    doc, _ = open_pdf(source)
+    try:
+        return [doc.load_page(i).get_text() for i in range(start, stop)]
+    finally:
+        doc.close()
+
+def _iter_pages_parallel(source, page_count, workers):
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_extract_page_range, source, start, stop) for start, stop in ranges]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+def iter_pdf_pages(source, max_pages=None, max_chars=None, workers=1):
+    """
+    Yield the text of each page in order, stopping after max_pages pages or
+    max_chars characters (the last page is cut to fit). With workers > 1,
+    long documents given as a path or bytes are extracted in parallel page ranges.
+    """
+    doc, opened_here = open_pdf(source)
+    try:
+        page_count = doc.page_count if max_pages is None else min(max_pages, doc.page_count)
+        if workers > 1 and page_count >= PARALLEL_MIN_PAGES and not isinstance(source, fitz.Document):
+            # The workers reopen the source themselves.
+            doc.close()
+            opened_here = False
+            pages = _iter_pages_parallel(source, page_count, workers)
+        else:
+            pages = (doc.load_page(i).get_text() for i in range(page_count))
+
+        remaining = max_chars
+        for text in pages:
+            if remaining is not None:
+                text = text[:remaining]
+                remaining -= len(text)
+            yield text
+            if remaining is not None and remaining <= 0:
+                break
+    finally:
+        if opened_here:
+            doc.close()
+
+def extract_text_from_pdf(pdf_path, max_pages=None, max_chars=None, workers=1):
+    return "".join(iter_pdf_pages(pdf_path, max_pages, max_chars, workers))
 
 def normalize_text(text):
     text = text.replace('|', ' ')
     text = re.sub(r'\s+', ' ', text)
     return text.strip().lower()
 
+class TextNormalizer:
+    """
+    normalize_text for text that arrives in pieces: feeding pieces one by one
+    produces the same characters as normalize_text on their concatenation.
+    """
+    def __init__(self):
+        self.started = False
+        self.space = False
+
+    def feed(self, text):
+        text = re.sub(r'\s+', ' ', text.replace('|', ' '))
+        core = text.strip()
+        if not core:
+            self.space = self.space or bool(text)
+            return ''
+        lead = ' ' if self.started and (self.space or text[0] == ' ') else ''
+        self.started = True
+        self.space = text[-1] == ' '
+        return lead + core.lower()
+
 def normalize_skill(skill):
     return re.sub(r'\s+', ' ', skill).strip().lower()
 
@@ -24,19 +105,73 @@ def load_skills_from_json(json_path):
         data = json.load(f)
     return set(data.get('skills', []))
 
-def extract_skills_with_exact_match(pdf_path, json_path):
-    text = extract_text_from_pdf(pdf_path)
-    skill_set = load_skills_from_json(json_path)
-    normalized_text = normalize_text(text)
-
-    found_skills = set()
-    for skill in skill_set:
-        normalized_skill = normalize_skill(skill)
-        if len(normalized_skill.split()) == 1:
-            if re.search(r'\b' + re.escape(normalized_skill) + r'\b', normalized_text):
-                found_skills.add(skill)
-        else:
-            if normalized_skill in normalized_text:
-                found_skills.add(skill)
+# Compiled matchers keyed on the skills file, rebuilt only when it changes.
+_matcher_cache = {}
+
+def _cached(kind, json_path, build):
+    key = (kind, os.path.abspath(json_path))
+    mtime = os.stat(key[1]).st_mtime_ns
+    cached = _matcher_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, build(load_skills_from_json(json_path)))
+        _matcher_cache[key] = cached
+    return cached[1]
+
+def load_skill_matcher(json_path):
+    # Exact matcher over every skill's own form plus its aliases / hyphen variants.
+    return _cached("exact", json_path, lambda skills: SkillMatcher(
+        (skill, normalize_skill(form)) for skill, form in surface_forms(skills)
+    ))
+
+def load_fuzzy_index(json_path, threshold=FUZZY_THRESHOLD):
+    return _cached(("fuzzy", threshold), json_path, lambda skills: FuzzySkillIndex(surface_forms(skills), threshold))
+
+def add_fuzzy_matches(found, hits):
+    # Fuzzy hits only count where no exact match already covers the text.
+    exact = [span for spans in found.values() for span in spans]
+    for skills, start, end, _ in hits:
+        if all(end <= s or start >= e for s, e in exact):
+            for skill in skills:
+                found.setdefault(skill, []).append((start, end))
+    return found
+
+def find_skills_in_text(text, json_path, fuzzy_threshold=FUZZY_THRESHOLD):
+    # {skill: [(start, end), ...]} with offsets into normalize_text(text)
+    text = normalize_text(text)
+    found = load_skill_matcher(json_path).find(text)
+    if fuzzy_threshold < 1:
+        add_fuzzy_matches(found, load_fuzzy_index(json_path, fuzzy_threshold).find(text))
+    return found
+
+def find_skills_in_pdf(pdf_path, json_path, max_pages=None, max_chars=None, workers=1, fuzzy_threshold=FUZZY_THRESHOLD):
+    # Pages are matched as they come out of the extractor, so matching
+    # overlaps with parsing and the full text is never held in memory.
+    scanner = load_skill_matcher(json_path).scanner()
+    fuzzy = load_fuzzy_index(json_path, fuzzy_threshold) if fuzzy_threshold < 1 else None
+    fuzzy_hits = []
+    normalizer = TextNormalizer()
+    pages = chars = 0
+    with metrics.span("skill_extraction"):
+        page_texts = metrics.timed_iter(iter_pdf_pages(pdf_path, max_pages, max_chars, workers), "pdf_parse")
+        for page_text in page_texts:
+            pages += 1
+            chars += len(page_text)
+            piece = normalizer.feed(page_text)
+            if fuzzy is not None:
+                base = scanner.offset
+                fuzzy_hits += [(skills, base + s, base + e, score) for skills, s, e, score in fuzzy.find(piece)]
+            scanner.feed(piece)
+        found = add_fuzzy_matches(scanner.finish(), fuzzy_hits)
+    metrics.observe("pdf_pages", pages, "Pages read per document")
+    metrics.observe("pdf_chars", chars, "Characters read per document")
+    metrics.observe("skills_found", len(found), "Distinct skills found per document")
+    return found
+
+def extract_skill_matches(pdf_path, json_path, max_pages=None, max_chars=None, workers=1, fuzzy_threshold=FUZZY_THRESHOLD):
+    matches = find_skills_in_pdf(pdf_path, json_path, max_pages, max_chars, workers, fuzzy_threshold)
+    return {skill: {"count": len(spans), "positions": spans} for skill, spans in sorted(matches.items())}
 
-    return sorted(found_skills)
\ No newline at end of file
+def extract_skills_with_exact_match(pdf_path, json_path, max_pages=None, max_chars=None, workers=1, fuzzy_threshold=FUZZY_THRESHOLD):
+    # Kept under its original name; aliases and (unless fuzzy_threshold >= 1)
+    # approximate matches are included too.
+    return sorted(find_skills_in_pdf(pdf_path, json_path, max_pages, max_chars, workers, fuzzy_threshold))
@@ -0,0 +1,185 @@
+# extractor/skill_matcher.py
+# Aho-Corasick matcher that finds every skill of the vocabulary in one pass
+# over the normalized text, instead of one regex / substring scan per skill.
+#
+# Semantics follow the original per-skill loop exactly:
+#   - single-word skills must sit between regex word boundaries (\b...\b)
+#   - multi-word skills match as plain substrings
+
+
+def _is_word(ch):
+    # Same character class as re's \w on str patterns.
+    return ch.isalnum() or ch == '_'
+
+def _at_boundary(text, i):
+    before = i > 0 and _is_word(text[i - 1])
+    after = i < len(text) and _is_word(text[i])
+    return before != after
+
+
+class SkillMatcher:
+    def __init__(self, patterns):
+        """
+        patterns: {original skill: normalized skill}, or (original skill,
+        normalized form) pairs when a skill has several forms (aliases).
+        Several originals may share one normalized form; all of them are
+        reported on a match.
+        """
+        if isinstance(patterns, dict):
+            patterns = patterns.items()
+        self.owners = {}          # normalized pattern -> original skills
+        for skill, normalized in patterns:
+            self.owners.setdefault(normalized, []).append(skill)
+
+        # An empty pattern is a substring of everything (as `'' in text` was).
+        self.always = self.owners.pop('', [])
+
+        self.goto = [{}]          # node -> {char: node}
+        self.fail = [0]
+        self.output = [None]      # node -> pattern ending here
+        self.out_link = [0]       # node -> nearest proper suffix node with an output (0 = none)
+        for pattern in self.owners:
+            self._add(pattern)
+        self._link()
+
+        # Single-word skills need \b checks; everything else is a substring hit.
+        self.needs_boundary = {p: len(p.split()) == 1 for p in self.owners}
+
+    def __len__(self):
+        return len(self.owners) + (1 if self.always else 0)
+
+    # ---------------------- BUILD ----------------------
+    def _add(self, pattern):
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.out_link.append(0)
+            node = nxt
+        self.output[node] = pattern
+
+    def _link(self):
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                fc = self.fail[child]
+                self.out_link[child] = fc if self.output[fc] is not None else self.out_link[fc]
+
+    # ---------------------- SEARCH ----------------------
+    def iter_matches(self, text):
+        """Yield (normalized skill, start, end) for every valid occurrence."""
+        goto, fail, output, out_link = self.goto, self.fail, self.output, self.out_link
+        needs_boundary = self.needs_boundary
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            hit = node if output[node] is not None else out_link[node]
+            while hit:
+                pattern = output[hit]
+                end = i + 1
+                start = end - len(pattern)
+                if not needs_boundary[pattern] or (_at_boundary(text, start) and _at_boundary(text, end)):
+                    yield pattern, start, end
+                hit = out_link[hit]
+
+    def find(self, text):
+        """{original skill: [(start, end), ...]} for every skill present in text."""
+        found = {skill: [] for skill in self.always}
+        for pattern, start, end in self.iter_matches(text):
+            for skill in self.owners[pattern]:
+                found.setdefault(skill, []).append((start, end))
+        return found
+
+    def match(self, text):
+        return set(self.find(text))
+
+    def scanner(self):
+        return SkillScanner(self)
+
+
+class SkillScanner:
+    """
+    Incremental version of SkillMatcher.find for text that arrives in pieces
+    (e.g. page by page). Pieces must already be normalized and concatenate to
+    the same string the one-shot matcher would see; offsets are into that
+    concatenation.
+    """
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.node = 0
+        self.offset = 0           # characters consumed so far
+        self.tail = ''            # last few characters, for start-boundary checks
+        self.keep = max((len(p) for p in matcher.owners), default=0) + 1
+        self.pending = []         # (pattern, start) whose end boundary needs the next character
+        self.found = {skill: [] for skill in matcher.always}
+
+    def _add(self, pattern, start, end):
+        for skill in self.matcher.owners[pattern]:
+            self.found.setdefault(skill, []).append((start, end))
+
+    def feed(self, text):
+        if not text:
+            return
+        m = self.matcher
+        goto, fail, output, out_link = m.goto, m.fail, m.output, m.out_link
+        needs_boundary = m.needs_boundary
+
+        # Matches that ended exactly at the previous piece's last character.
+        next_is_word = _is_word(text[0])
+        for pattern, start in self.pending:
+            prev_is_word = _is_word(self.tail[-1])
+            if prev_is_word != next_is_word:
+                self._add(pattern, start, self.offset)
+        self.pending = []
+
+        window = self.tail + text
+        base = self.offset - len(self.tail)
+        node = self.node
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            hit = node if output[node] is not None else out_link[node]
+            while hit:
+                pattern = output[hit]
+                end = self.offset + i + 1
+                start = end - len(pattern)
+                if not needs_boundary[pattern]:
+                    self._add(pattern, start, end)
+                elif _at_boundary(window, start - base):
+                    if end - base < len(window):
+                        if _at_boundary(window, end - base):
+                            self._add(pattern, start, end)
+                    else:
+                        self.pending.append((pattern, start))
+                hit = out_link[hit]
+
+        self.node = node
+        self.offset += len(text)
+        self.tail = window[-self.keep:]
+
+    def finish(self):
+        # End of text counts as a non-word character.
+        for pattern, start in self.pending:
+            if _is_word(self.tail[-1]):
+                self._add(pattern, start, self.offset)
+        self.pending = []
+        return self.found
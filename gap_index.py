@@ -0,0 +1,131 @@
+# gap_index.py
+# Role/domain -> required-skill index used for gap analysis.
+#
+# Skills are interned to integer ids and every (role, domain) pair gets one
+# row of a boolean matrix marking its required skills. Looking up a pair is a
+# dict hit, and gap / overlap / coverage are vector ops on one row (or on the
+# whole matrix for the bulk calls), so the cost no longer depends on how many
+# rows final.csv has.
+import numpy as np
+
+
+class SkillGapIndex:
+    def __init__(self, skills, pair_keys, pair_labels, required):
+        self.skills = np.asarray(skills, dtype=object)       # id -> skill
+        self.skill_ids = {s: i for i, s in enumerate(skills)}  # skill -> id
+        self.pair_keys = list(pair_keys)                       # row -> (role, domain) lower-cased
+        self.pair_labels = list(pair_labels)                   # row -> (role, domain) as in the data
+        self.pair_rows = {k: i for i, k in enumerate(self.pair_keys)}
+        self.required = required                               # (n_pairs, n_skills) bool
+        self.required_counts = required.sum(axis=1)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        skill_ids = {}
+        rows = {}
+        labels = {}
+        for role, domain, skills in zip(df['Role'], df['Domain'], df['Skills']):
+            key = (role.lower(), domain.lower())
+            labels.setdefault(key, (role.strip(), domain.strip()))
+            ids = rows.setdefault(key, set())
+            for skill in skills:
+                ids.add(skill_ids.setdefault(skill, len(skill_ids)))
+
+        skills = sorted(skill_ids)
+        # Renumber so ids follow sorted skill order (stable across builds).
+        remap = np.empty(len(skill_ids), dtype=np.int64)
+        order = {s: i for i, s in enumerate(skills)}
+        for skill, old_id in skill_ids.items():
+            remap[old_id] = order[skill]
+
+        pair_keys = sorted(rows)
+        required = np.zeros((len(pair_keys), len(skills)), dtype=bool)
+        for row, key in enumerate(pair_keys):
+            ids = np.fromiter(rows[key], dtype=np.int64, count=len(rows[key]))
+            required[row, remap[ids]] = True
+        return cls(skills, pair_keys, [labels[k] for k in pair_keys], required)
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], np.zeros((0, 0), dtype=bool))
+
+    def add_rows(self, df):
+        """
+        Fold new postings (Role / Domain / normalized Skills) into the index in
+        place. Unseen skills and (role, domain) pairs are appended as new ids
+        and rows; existing pairs gain any newly listed skills.
+        """
+        new_skills = []
+        new_pairs = []
+        updates = []
+        for role, domain, skills in zip(df['Role'], df['Domain'], df['Skills']):
+            key = (role.lower(), domain.lower())
+            if key not in self.pair_rows:
+                self.pair_rows[key] = len(self.pair_keys) + len(new_pairs)
+                new_pairs.append((key, (role.strip(), domain.strip())))
+            ids = []
+            for skill in skills:
+                if skill not in self.skill_ids:
+                    self.skill_ids[skill] = len(self.skills) + len(new_skills)
+                    new_skills.append(skill)
+                ids.append(self.skill_ids[skill])
+            updates.append((self.pair_rows[key], ids))
+
+        if new_skills or new_pairs:
+            n_pairs, n_skills = self.required.shape
+            required = np.zeros((n_pairs + len(new_pairs), n_skills + len(new_skills)), dtype=bool)
+            required[:n_pairs, :n_skills] = self.required
+            self.required = required
+            self.skills = np.concatenate([self.skills, np.asarray(new_skills, dtype=object)])
+            self.pair_keys += [key for key, _ in new_pairs]
+            self.pair_labels += [label for _, label in new_pairs]
+        elif not self.required.flags.writeable:
+            self.required = np.array(self.required)   # memory-mapped read-only on load
+        for row, ids in updates:
+            self.required[row, ids] = True
+        self.required_counts = self.required.sum(axis=1)
+        return len(new_skills), len(new_pairs)
+
+    # ---------------------- ENCODING ----------------------
+    def encode(self, normalized_skills):
+        vec = np.zeros(len(self.skills), dtype=bool)
+        ids = [self.skill_ids[s] for s in normalized_skills if s in self.skill_ids]
+        vec[ids] = True
+        return vec
+
+    def row(self, role, domain):
+        return self.pair_rows.get((role.lower(), domain.lower()))
+
+    def _skill_set(self, mask):
+        return set(self.skills[mask])
+
+    # ---------------------- QUERIES ----------------------
+    def gap(self, user_set, role, domain, user_vec=None):
+        row = self.row(role, domain)
+        if row is None:
+            return user_set, set(), set()
+        if user_vec is None:
+            user_vec = self.encode(user_set)
+        required = self.required[row]
+        return user_set, self._skill_set(required), self._skill_set(required & ~user_vec)
+
+    def gaps_for(self, user_set, pairs):
+        # One encode shared by every (role, domain) pair.
+        user_vec = self.encode(user_set)
+        return [self.gap(user_set, role, domain, user_vec) for role, domain in pairs]
+
+    def coverage_all(self, user_set):
+        """
+        Overlap / gap counts and coverage ratio for every (role, domain) pair
+        in one pass over the matrix. Pairs with no listed skills get coverage 0.
+        """
+        user_vec = self.encode(user_set)
+        overlap = (self.required & user_vec).sum(axis=1)
+        gap = self.required_counts - overlap
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage = np.where(self.required_counts > 0, overlap / self.required_counts, 0.0)
+        return [
+            (role, domain, int(n_req), int(n_over), int(n_gap), float(cov))
+            for (role, domain), n_req, n_over, n_gap, cov
+            in zip(self.pair_labels, self.required_counts, overlap, gap, coverage)
+        ]
@@ -0,0 +1,160 @@
+# incremental_training.py
+# Incremental updates for the role/domain predictor as new postings arrive.
+#
+#   python incremental_training.py                                   # first build, from final.csv
+#   python incremental_training.py --ingest new_postings.csv         # fold in rows not seen before
+#   python incremental_training.py --ingest final_synthetic_job_postings.csv
+#
+# The "incremental" backend pairs a stateless HashingVectorizer with an
+# IncrementalCentroidClassifier, so a new posting only adds to its class sum
+# and nothing is refit. New role/domain pairs get the next label id, the gap
+# index grows in place, and every update is published as a new versioned
+# build (the same CURRENT pointer flip as model_artifacts.py). Serving
+# processes pick it up via domainn_predictor's reload watcher.
+#
+# Rows are identified by a hash of (role, domain, skills), kept in the build,
+# so ingesting a file that has only grown trains on the new rows alone.
+import argparse
+import hashlib
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import LabelEncoder
+
+from gap_index import SkillGapIndex
+from inference_backends import INCREMENTAL_BACKEND, IncrementalCentroidClassifier
+from model_artifacts import (
+    ARTIFACT_DIR, ARTIFACT_FILES, DATASET_PATH, load_artifacts, load_training_data, read_manifest, save_artifacts,
+)
+
+HASH_FEATURES = 2 ** 20
+INCREMENTAL_FILES = dict(ARTIFACT_FILES, ingest_state="ingest_state.joblib")
+
+
+class GrowingLabelEncoder(LabelEncoder):
+    """LabelEncoder whose ids never change: unseen labels are appended, not sorted in."""
+    def fit(self, y):
+        self.__dict__.pop("classes_", None)
+        return self.partial_fit(y)
+
+    def partial_fit(self, y):
+        classes = list(getattr(self, "classes_", []))
+        known = set(classes)
+        for label in y:
+            if label not in known:
+                known.add(label)
+                classes.append(label)
+        self.classes_ = np.array(classes, dtype=object)
+        return self
+
+    def transform(self, y):
+        ids = {label: i for i, label in enumerate(self.classes_)}
+        try:
+            return np.array([ids[label] for label in y], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"y contains previously unseen label {e}") from None
+
+    def fit_transform(self, y):
+        return self.fit(y).transform(y)
+
+
+def make_vectorizer():
+    # Stateless: no vocabulary to refit when new skills show up.
+    return HashingVectorizer(ngram_range=(1, 3), n_features=HASH_FEATURES, alternate_sign=False)
+
+def row_digests(df):
+    # 64-bit id per (role, domain, skill set), order- and case-insensitive.
+    digests = np.empty(len(df), dtype=np.uint64)
+    for i, (role, domain, skills) in enumerate(zip(df['Role'], df['Domain'], df['Skills'])):
+        text = "|".join([role.strip().lower(), domain.strip().lower(), *sorted(set(skills))])
+        digests[i] = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    return digests
+
+def fingerprint(digests):
+    return hashlib.sha256(np.sort(digests).tobytes()).hexdigest()
+
+
+# ---------------------- UPDATE ----------------------
+def empty_artifacts():
+    return {
+        "backend": INCREMENTAL_BACKEND,
+        "vectorizer": make_vectorizer(),
+        "model": IncrementalCentroidClassifier(),
+        "label_encoder": GrowingLabelEncoder(),
+        "gap_index": SkillGapIndex.empty(),
+        "ingest_state": {"row_digests": np.empty(0, dtype=np.uint64), "sources": []},
+        "manifest": None,
+    }
+
+def update(artifacts, df, source):
+    """Train on the rows of df not seen before. Returns (new rows, new labels, new skills)."""
+    state = artifacts["ingest_state"]
+    digests = row_digests(df)
+    _, first = np.unique(digests, return_index=True)
+    fresh = np.sort(first[~np.isin(digests[first], state["row_digests"])])
+    if len(fresh) == 0:
+        return 0, 0, 0
+    new_rows = df.iloc[fresh]
+
+    encoder = artifacts["label_encoder"]
+    n_labels = len(getattr(encoder, "classes_", []))
+    y = encoder.partial_fit(new_rows['Combined_Label']).transform(new_rows['Combined_Label'])
+    X = artifacts["vectorizer"].transform(new_rows['Skills_str'])
+    artifacts["model"].partial_fit(X, y)
+    new_skills, _ = artifacts["gap_index"].add_rows(new_rows)
+
+    state["row_digests"] = np.union1d(state["row_digests"], digests[fresh])
+    state["sources"].append({"source": os.path.basename(source), "rows": int(len(fresh))})
+    return len(fresh), len(encoder.classes_) - n_labels, new_skills
+
+def publish(artifacts, artifact_dir=ARTIFACT_DIR):
+    parent = artifacts["manifest"]["build_id"] if artifacts["manifest"] else None
+    state = artifacts["ingest_state"]
+    build_dir = save_artifacts(
+        artifacts, fingerprint(state["row_digests"]), artifact_dir, files=INCREMENTAL_FILES,
+        manifest_extra={"incremental": True, "parent_build": parent, "rows": int(len(state["row_digests"]))},
+    )
+    artifacts["manifest"] = read_manifest(build_dir)
+    return build_dir
+
+def load_current(artifact_dir=ARTIFACT_DIR):
+    # Private copies (no mmap): the update mutates the model and gap index.
+    artifacts = load_artifacts(artifact_dir, mmap_mode=None, backend=INCREMENTAL_BACKEND)
+    return artifacts if artifacts is not None else empty_artifacts()
+
+def bootstrap(dataset_path=DATASET_PATH, artifact_dir=ARTIFACT_DIR):
+    # First build (or the fallback when none exists), trained on the whole dataset.
+    artifacts = empty_artifacts()
+    update(artifacts, load_training_data(dataset_path), dataset_path)
+    try:
+        publish(artifacts, artifact_dir)
+    except OSError as e:
+        print(f"Could not save model artifacts: {e}")
+    return artifacts
+
+def ingest(paths, artifact_dir=ARTIFACT_DIR):
+    artifacts = load_current(artifact_dir)
+    changed = False
+    for path in paths:
+        rows, labels, skills = update(artifacts, load_training_data(path), path)
+        print(f"{path}: {rows} new rows, {labels} new role/domain labels, {skills} new skills")
+        changed = changed or rows > 0
+    if changed:
+        publish(artifacts, artifact_dir)
+    return artifacts, changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally update the role/domain predictor with new postings.")
+    parser.add_argument("--ingest", nargs="+", default=[DATASET_PATH], metavar="CSV",
+                        help="postings with Role/Domain/Skills (or Job Title/Domain/Required Skills) columns")
+    parser.add_argument("--out", default=ARTIFACT_DIR)
+    args = parser.parse_args()
+
+    artifacts, changed = ingest(args.ingest, args.out)
+    manifest = artifacts["manifest"]
+    if changed:
+        print(f"Published {manifest['build_id']} ({manifest['rows']} rows, {manifest['n_classes']} labels)")
+    else:
+        print("Nothing new to ingest; current build unchanged.")
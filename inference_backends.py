@@ -0,0 +1,109 @@
+# inference_backends.py
+# Interchangeable classifiers for the role/domain predictor.
+#
+# Every backend is a scikit-learn style estimator (fit / predict_proba /
+# classes_) over the TF-IDF skill vectors, so domainn_predictor and the
+# artifact builder don't care which one is in use. Select one with the
+# SKILLFIT_BACKEND environment variable or `model_artifacts.py --backend`.
+# The "incremental" backend is built by incremental_training.py instead.
+import os
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import normalize
+
+DEFAULT_BACKEND = "forest"
+INCREMENTAL_BACKEND = "incremental"
+
+
+class CosineCentroidClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Nearest-centroid classifier under cosine similarity. Each class is the
+    L2-normalized mean of its training rows; probabilities are a softmax over
+    the similarities, sharpened by `temperature`.
+    """
+    def __init__(self, temperature=0.05):
+        self.temperature = temperature
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        self.classes_, y_idx = np.unique(y, return_inverse=True)
+        X = normalize(X)
+        centroids = np.zeros((len(self.classes_), X.shape[1]))
+        for k in range(len(self.classes_)):
+            centroids[k] = np.asarray(X[y_idx == k].mean(axis=0)).ravel()
+        self.centroids_ = normalize(centroids)
+        return self
+
+    def decision_function(self, X):
+        return np.asarray(normalize(X) @ self.centroids_.T)
+
+    def predict_proba(self, X):
+        scores = self.decision_function(X) / self.temperature
+        scores -= scores.max(axis=1, keepdims=True)
+        probs = np.exp(scores)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.decision_function(X), axis=1)]
+
+
+class IncrementalCentroidClassifier(CosineCentroidClassifier):
+    """
+    CosineCentroidClassifier that learns from new rows, and new classes,
+    without revisiting old ones. A centroid only depends on the sum of its
+    class's L2-normalized rows, so partial_fit adds to per-class sums (kept
+    sparse, since hashed feature spaces are wide). Classes are the integer
+    ids 0..n-1 handed out by incremental_training.GrowingLabelEncoder.
+    """
+    def fit(self, X, y):
+        for attr in ("sums_", "counts_", "classes_", "centroids_"):
+            self.__dict__.pop(attr, None)
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y):
+        y = np.asarray(y, dtype=np.int64)
+        X = normalize(sp.csr_matrix(X))
+        old_classes = len(self.counts_) if hasattr(self, "counts_") else 0
+        n_classes = max(old_classes, int(y.max()) + 1 if len(y) else 0)
+
+        # (n_classes, n_rows) indicator @ X sums this batch's rows per class.
+        indicator = sp.csr_matrix((np.ones(len(y)), (y, np.arange(len(y)))), shape=(n_classes, len(y)))
+        sums = indicator @ X
+        counts = np.bincount(y, minlength=n_classes)
+        if old_classes:
+            grown = sp.vstack([self.sums_, sp.csr_matrix((n_classes - old_classes, X.shape[1]))])
+            sums = sums + grown
+            counts[:old_classes] += self.counts_
+
+        self.sums_ = sp.csr_matrix(sums)
+        self.counts_ = counts
+        self.classes_ = np.arange(n_classes)
+        self.centroids_ = normalize(self.sums_)
+        return self
+
+    def decision_function(self, X):
+        return (normalize(X) @ self.centroids_.T).toarray()
+
+
+BACKENDS = {
+    # The original model: 150-tree forest.
+    "forest": lambda: RandomForestClassifier(n_estimators=150, random_state=42),
+    # Sparse multinomial logistic regression: one dot product per class.
+    "linear": lambda: LogisticRegression(C=10.0, max_iter=2000),
+    # Cosine nearest-centroid: one dot product per class, tiny on disk.
+    "centroid": lambda: CosineCentroidClassifier(),
+}
+
+
+def make_backend(name):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown backend {name!r}; choose one of {', '.join(BACKENDS)}") from None
+
+def backend_from_env():
+    return os.environ.get("SKILLFIT_BACKEND", DEFAULT_BACKEND)
@@ -0,0 +1,465 @@
+# inference_service.py
+# Standalone HTTP service for programmatic access (e.g. from an ATS).
+#
+#   python inference_service.py --port 8080 --workers 4
+#
+# Endpoints (all POST bodies return the same JSON as a batch_process record):
+#   POST /v1/analyze/pdf     raw PDF bytes
+#   POST /v1/analyze/text    plain text, or JSON {"text": "..."}
+#   POST /v1/analyze/skills  JSON {"skills": ["Python", ...]}
+#   GET  /healthz            process is up
+#   GET  /readyz             model loaded and PDF workers started (503 until then)
+#   GET  /metrics            Prometheus text (with SKILLFIT_METRICS=1)
+# Query parameters top_n (default 5) and gap_n (default 3) apply to every
+# analyze endpoint.
+#
+# Plain asyncio + stdlib, no web framework. PDF parsing and skill matching
+# run in a process pool; concurrent requests for predictions are coalesced
+# into micro-batches so the model is called once per batch, not per request.
+# When more than --max-pending requests are in progress new ones get a 503
+# with Retry-After instead of queueing without bound.
+import argparse
+import asyncio
+import concurrent.futures as cf
+import http.client
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+import metrics
+from batch_process import result_fields
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.json")
+MAX_BODY_BYTES = 20 * 1024 * 1024
+MAX_PDF_PAGES = 40
+MAX_PDF_CHARS = 200_000
+MAX_TOP_N = 50
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+# ---------------------- PDF / TEXT WORKERS ----------------------
+_worker = {}
+
+def init_worker(skills_path):
+    # Runs once per worker process; the matcher is built here, not per request.
+    from extractor.Skill_extractor import extract_skills_with_exact_match, find_skills_in_text, load_skill_matcher
+
+    load_skill_matcher(skills_path)
+    _worker["extract_pdf"] = extract_skills_with_exact_match
+    _worker["find_in_text"] = find_skills_in_text
+    _worker["skills_path"] = skills_path
+
+def extract_from_pdf(pdf_bytes):
+    return _worker["extract_pdf"](pdf_bytes, _worker["skills_path"], max_pages=MAX_PDF_PAGES, max_chars=MAX_PDF_CHARS)
+
+def extract_from_text(text):
+    return sorted(_worker["find_in_text"](text[:MAX_PDF_CHARS], _worker["skills_path"]))
+
+def worker_ready():
+    return os.getpid()
+
+
+# ---------------------- MICRO-BATCHING ----------------------
+class MicroBatcher:
+    """
+    Collects concurrent prediction requests and runs them as one
+    predict_top_roles_domains_batch call once `max_batch` requests are queued
+    or the oldest has waited `max_wait` seconds. The model runs on a single
+    thread so the event loop stays responsive.
+    """
+    def __init__(self, predictor, max_batch=64, max_wait=0.005):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.executor = cf.ThreadPoolExecutor(1, thread_name_prefix="model")
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, skills, top_n, gap_n):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((skills, top_n, gap_n, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            started = time.perf_counter()
+            for *_, enqueued in batch:
+                metrics.observe("service_queue_wait_seconds", started - enqueued)
+            metrics.observe("service_batch_size", len(batch), "Requests coalesced per model call")
+            try:
+                results = await loop.run_in_executor(self.executor, self._predict, batch)
+            except Exception as e:
+                for *_, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (*_, future, _), result in zip(batch, results):
+                if not future.done():   # the client may have gone away
+                    future.set_result(result)
+
+    def _predict(self, batch):
+        # One model call for the whole batch at the largest top_n requested;
+        # each request gets its own slice and gap analysis.
+        max_top_n = max(top_n for _, top_n, *_ in batch)
+        with_skills = [skills for skills, *_ in batch if skills]
+        predictions = iter(self.predictor.predict_top_roles_domains_batch(with_skills, top_n=max_top_n))
+        results = []
+        for skills, top_n, gap_n, *_ in batch:
+            if not skills:
+                results.append(result_fields(skills, [], []))
+                continue
+            top = next(predictions)[:top_n]
+            gaps = self.predictor.get_gap_skills_for_predictions(skills, top, gap_n)
+            results.append(result_fields(skills, top, gaps))
+        return results
+
+
+# ---------------------- SERVICE ----------------------
+class InferenceService:
+    def __init__(self, workers=None, skills_path=SKILLS_PATH, max_batch=64, max_wait=0.005, max_pending=256):
+        self.workers = workers or os.cpu_count() or 1
+        self.skills_path = skills_path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.pending = 0
+        self.ready = False
+        self.pool = None
+        self.batcher = None
+        self.server = None
+        self.warm_up_task = None
+        self.warm_up_error = None
+        self.routes = {
+            ("GET", "/healthz"): self.handle_health,
+            ("GET", "/readyz"): self.handle_ready,
+            ("GET", "/metrics"): self.handle_metrics,
+            ("POST", "/v1/analyze/pdf"): self.handle_pdf,
+            ("POST", "/v1/analyze/text"): self.handle_text,
+            ("POST", "/v1/analyze/skills"): self.handle_skills,
+        }
+
+    async def start(self, host="127.0.0.1", port=8080):
+        # Listen straight away so /healthz answers while the model loads.
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        self.warm_up_task = asyncio.get_running_loop().create_task(self._warm_up())
+        self.warm_up_task.add_done_callback(self._warm_up_done)
+        return self.server
+
+    def _warm_up_done(self, task):
+        # A service that can never become ready should not sit behind a 503
+        # forever: log why and stop listening, so serve() exits non-zero.
+        if task.cancelled() or task.exception() is None:
+            return
+        self.warm_up_error = task.exception()
+        print("Warm-up failed, shutting down:", file=sys.stderr)
+        traceback.print_exception(self.warm_up_error, file=sys.stderr)
+        self.server.close()
+
+    def _new_pool(self):
+        # Spawned (not forked) workers: the parent has threads running by now.
+        return cf.ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker, initargs=(self.skills_path,),
+        )
+
+    async def _warm_up(self):
+        loop = asyncio.get_running_loop()
+        self.pool = self._new_pool()
+        started = [loop.run_in_executor(self.pool, worker_ready) for _ in range(self.workers)]
+        with cf.ThreadPoolExecutor(1) as loader:
+            predictor = await loop.run_in_executor(loader, _load_predictor)
+        await asyncio.gather(*started)
+        self.batcher = MicroBatcher(predictor, self.max_batch, self.max_wait)
+        self.batcher.start()
+        self.ready = True
+        print(f"Ready: model {predictor.model_version}, {self.workers} PDF workers")
+
+    async def stop(self):
+        self.ready = False
+        if self.warm_up_task and not self.warm_up_task.done():
+            self.warm_up_task.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.batcher:
+            await self.batcher.stop()
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------- HTTP ----------------------
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    await write_response(writer, e.status, {"error": str(e)}, e.headers, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, query, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload, extra = await self.dispatch(method, path, query, headers, body)
+                await write_response(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, query, headers, body):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            allowed = [m for m, p in self.routes if p == path]
+            if allowed:
+                return 405, {"error": "method not allowed"}, {"Allow": ", ".join(allowed)}
+            return 404, {"error": "not found"}, {}
+        try:
+            return 200, await handler(query, headers, body), {}
+        except HTTPError as e:
+            metrics.inc(f"service_http_{e.status}_total")
+            return e.status, {"error": str(e)}, e.headers
+        except Exception as e:
+            metrics.inc("service_http_500_total")
+            return 500, {"error": f"{type(e).__name__}: {e}"}, {}
+
+    async def analyze(self, endpoint, query, extract, payload):
+        # Shared path for the analyze endpoints: readiness, backpressure,
+        # skill extraction in the pool (if any), then the batched model call.
+        if not self.ready:
+            raise HTTPError(503, "model is loading", {"Retry-After": "1"})
+        if self.pending >= self.max_pending:
+            raise HTTPError(503, "server busy", {"Retry-After": "1"})
+        top_n = query_int(query, "top_n", 5, 1, MAX_TOP_N)
+        gap_n = query_int(query, "gap_n", 3, 0, MAX_TOP_N)
+
+        self.pending += 1
+        metrics.observe("service_pending_requests", self.pending)
+        try:
+            with metrics.span(f"service_{endpoint}"):
+                if extract is None:
+                    skills = payload
+                else:
+                    pool = self.pool
+                    try:
+                        skills = await asyncio.get_running_loop().run_in_executor(pool, extract, payload)
+                    except BrokenProcessPool:
+                        # A worker died hard (e.g. inside MuPDF); the first request
+                        # to notice replaces the pool.
+                        if self.pool is pool:
+                            self.pool = self._new_pool()
+                        metrics.inc("service_worker_crashes_total")
+                        raise HTTPError(503, "PDF worker crashed; retry", {"Retry-After": "1"}) from None
+                    except Exception as e:
+                        raise HTTPError(422, f"could not read input: {type(e).__name__}: {e}") from None
+                return await self.batcher.submit(skills, top_n, gap_n)
+        finally:
+            self.pending -= 1
+
+    async def handle_pdf(self, query, headers, body):
+        if not body.startswith(b"%PDF"):
+            raise HTTPError(415, "body is not a PDF")
+        return await self.analyze("pdf", query, extract_from_pdf, body)
+
+    async def handle_text(self, query, headers, body):
+        if headers.get("content-type", "").startswith("application/json"):
+            text = parse_json(body).get("text")
+            if not isinstance(text, str):
+                raise HTTPError(400, '"text" must be a string')
+        else:
+            text = body.decode("utf-8", errors="replace")
+        return await self.analyze("text", query, extract_from_text, text)
+
+    async def handle_skills(self, query, headers, body):
+        skills = parse_json(body).get("skills")
+        if not isinstance(skills, list) or not all(isinstance(s, str) for s in skills):
+            raise HTTPError(400, '"skills" must be a list of strings')
+        return await self.analyze("skills", query, None, skills)
+
+    async def handle_health(self, query, headers, body):
+        return {"status": "ok"}
+
+    async def handle_ready(self, query, headers, body):
+        if not self.ready:
+            raise HTTPError(503, "not ready", {"Retry-After": "1"})
+        return {"status": "ready", "model_version": self.batcher.predictor.model_version,
+                "pending": self.pending, "workers": self.workers}
+
+    async def handle_metrics(self, query, headers, body):
+        return metrics.render_prometheus()
+
+
+def _load_predictor():
+    import domainn_predictor
+    domainn_predictor.start_watcher()
+    return domainn_predictor
+
+def query_int(query, name, default, low, high):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer") from None
+    if not low <= value <= high:
+        raise HTTPError(400, f"{name} must be between {low} and {high}")
+    return value
+
+def parse_json(body):
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise HTTPError(400, "body is not valid JSON") from None
+    if not isinstance(data, dict):
+        raise HTTPError(400, "body must be a JSON object")
+    return data
+
+async def read_request(reader):
+    # Minimal HTTP/1.1: request line, headers, Content-Length body. None on a
+    # clean close between requests.
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(411, "chunked bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, "bad Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    return method.upper(), url.path, parse_qs(url.query), headers, body
+
+async def write_response(writer, status, payload, headers=None, keep_alive=True):
+    if isinstance(payload, str):
+        body, ctype = payload.encode("utf-8"), "text/plain; version=0.0.4"
+    else:
+        body, ctype = json.dumps(payload).encode("utf-8"), "application/json"
+    head = [
+        f"HTTP/1.1 {status} {http.client.responses.get(status, '')}",
+        f"Content-Type: {ctype}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+# ---------------------- CLIENT ----------------------
+class InferenceClient:
+    """Small blocking client over one keep-alive connection, for scripts and tests."""
+    def __init__(self, host="127.0.0.1", port=8080, timeout=60):
+        self.conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method, path, body=None, content_type=None, **params):
+        if params:
+            path += "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        headers = {"Content-Type": content_type} if content_type else {}
+        self.conn.request(method, path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        data = response.read()
+        if response.getheader("Content-Type", "").startswith("application/json"):
+            data = json.loads(data)
+        return response.status, data
+
+    def analyze_pdf(self, pdf_bytes, **params):
+        return self.request("POST", "/v1/analyze/pdf", pdf_bytes, "application/pdf", **params)
+
+    def analyze_text(self, text, **params):
+        return self.request("POST", "/v1/analyze/text", text.encode("utf-8"), "text/plain; charset=utf-8", **params)
+
+    def analyze_skills(self, skills, **params):
+        return self.request("POST", "/v1/analyze/skills", json.dumps({"skills": skills}).encode("utf-8"), "application/json", **params)
+
+    def ready(self):
+        return self.request("GET", "/readyz")[0] == 200
+
+    def close(self):
+        self.conn.close()
+
+
+async def serve(args):
+    service = InferenceService(args.workers, args.skills, args.max_batch, args.max_wait_ms / 1000, args.max_pending)
+    server = await service.start(args.host, args.port)
+    print(f"Listening on http://{args.host}:{args.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        if service.warm_up_error is None:
+            raise
+        return 1
+    finally:
+        await service.stop()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP inference service for skill extraction, role prediction and gap analysis.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for PDF parsing and skill matching")
+    parser.add_argument("--skills", default=SKILLS_PATH, help="skills vocabulary JSON")
+    parser.add_argument("--max-batch", type=int, default=64, help="most requests coalesced into one model call")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="longest a request waits for its batch to fill")
+    parser.add_argument("--max-pending", type=int, default=256, help="requests in progress before new ones get 503")
+    args = parser.parse_args(argv)
+
+    metrics.start_exporter()
+    try:
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# metrics.py
+# Lightweight per-stage timing spans, counters and value distributions.
+#
+# Off by default: span() hands back a shared no-op context manager and
+# observe()/inc() return immediately. Turn on with SKILLFIT_METRICS=1 (or
+# metrics.enable()). Data stays in-process and can be read as:
+#   - Prometheus text:  render_prometheus(), or GET /metrics on the exporter
+#                       started with SKILLFIT_METRICS_PORT=<port>
+#   - JSON lines:       snapshot() / dump_jsonl(path), or SKILLFIT_METRICS_FILE
+#                       to append a snapshot after each analysed upload
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUANTILES = (0.5, 0.95, 0.99)
+RESERVOIR_SIZE = 2048   # most recent samples kept per metric for quantiles
+
+ENABLED = os.environ.get("SKILLFIT_METRICS", "").lower() in ("1", "true", "yes")
+
+_lock = threading.Lock()
+_histograms = {}   # name -> Histogram
+_counters = {}     # name -> float
+_help = {}         # name -> description, for Prometheus HELP lines
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = [0.0] * RESERVOIR_SIZE
+        self.next = 0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.samples[self.next] = value
+        self.next = (self.next + 1) % RESERVOIR_SIZE
+
+    def quantiles(self):
+        kept = sorted(self.samples[:min(self.count, RESERVOIR_SIZE)])
+        if not kept:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: kept[min(len(kept) - 1, int(q * len(kept)))] for q in QUANTILES}
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ---------------------- RECORDING ----------------------
+def observe(name, value, help_text=None):
+    if not ENABLED:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+            if help_text:
+                _help[name] = help_text
+        hist.add(value)
+
+def inc(name, value=1, help_text=None):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+        if help_text and name not in _help:
+            _help[name] = help_text
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+@contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        inc(f"{name}_errors_total")
+        raise
+    finally:
+        observe(f"{name}_seconds", time.perf_counter() - start)
+        inc(f"{name}_total")
+
+def span(name):
+    """Time a block as `<name>_seconds`; exceptions count as `<name>_errors_total`."""
+    return _timed(name) if ENABLED else _NOOP
+
+def timed(name):
+    # Decorator form of span().
+    def wrap(fn):
+        def inner(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        inner.__name__ = fn.__name__
+        inner.__doc__ = fn.__doc__
+        return inner
+    return wrap
+
+def timed_iter(iterable, name):
+    """
+    Yield from iterable, recording the total time spent producing items as
+    one `<name>_seconds` sample. Used where producing and consuming interleave,
+    e.g. PDF page extraction feeding the skill matcher.
+    """
+    if not ENABLED:
+        return iterable
+
+    def gen():
+        spent = 0.0
+        it = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    spent += time.perf_counter() - start
+                    break
+                spent += time.perf_counter() - start
+                yield item
+        except BaseException:
+            inc(f"{name}_errors_total")
+            raise
+        finally:
+            observe(f"{name}_seconds", spent)
+            inc(f"{name}_total")
+    return gen()
+
+
+# ---------------------- EXPORT ----------------------
+def snapshot():
+    with _lock:
+        hists = {name: (h.count, h.total, h.quantiles()) for name, h in _histograms.items()}
+        counters = dict(_counters)
+    return {
+        "timestamp": time.time(),
+        "pid": os.getpid(),
+        "counters": counters,
+        "histograms": {
+            name: {"count": count, "sum": total, **{f"p{int(q * 100)}": v for q, v in qs.items()}}
+            for name, (count, total, qs) in hists.items()
+        },
+    }
+
+def dump_jsonl(path=None):
+    path = path or os.environ.get("SKILLFIT_METRICS_FILE")
+    if not ENABLED or not path:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(snapshot()) + "\n")
+
+def render_prometheus(prefix="skillfit_"):
+    snap = snapshot()
+    lines = []
+    for name, value in sorted(snap["counters"].items()):
+        metric = prefix + name
+        if name in _help:
+            lines.append(f"# HELP {metric} {_help[name]}")
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    for name, h in sorted(snap["histograms"].items()):
+        metric = prefix + name
+        if name in _help:
+            lines.append(f"# HELP {metric} {_help[name]}")
+        lines.append(f"# TYPE {metric} summary")
+        for q in QUANTILES:
+            lines.append(f'{metric}{{quantile="{q}"}} {h[f"p{int(q * 100)}"]}')
+        lines.append(f"{metric}_sum {h['sum']}")
+        lines.append(f"{metric}_count {h['count']}")
+    return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics.json"):
+            body, ctype = json.dumps(snapshot()).encode(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, ctype = render_prometheus().encode(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+_exporter = None
+
+def start_exporter(port=None, host="127.0.0.1"):
+    """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+    global _exporter
+    port = port or os.environ.get("SKILLFIT_METRICS_PORT")
+    if _exporter is not None or not port:
+        return _exporter
+    try:
+        _exporter = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    except OSError as e:
+        print(f"Metrics exporter not started on port {port}: {e}")
+        return None
+    threading.Thread(target=_exporter.serve_forever, daemon=True).start()
+    return _exporter
@@ -0,0 +1,295 @@
+# model_artifacts.py
+# Build step + runtime loader for the role/domain predictor.
+#
+#   python model_artifacts.py                     # build from final.csv into Model/artifacts
+#   python model_artifacts.py --backend linear    # build another inference backend
+#   python model_artifacts.py --force             # rebuild even if the current build is fresh
+#
+# Each build goes to its own directory (Model/artifacts/<backend>/<build_id>/)
+# and that backend's CURRENT file points at the live one, so a rebuild never touches files that
+# running workers have memory-mapped.
+#
+# Memory-mapping only covers plain numpy arrays in the pickles (idf weights,
+# the gap index, linear coefficients). sklearn copies a tree's node arrays
+# out of the map when it unpickles them, so every process that loads a forest
+# holds its own copy. To share one forest across workers, load it once in a
+# parent and fork the workers from it (see batch_process.py).
+import argparse
+import ast
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import classification_report
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+from sklearn.utils.multiclass import unique_labels
+
+from gap_index import SkillGapIndex
+from inference_backends import BACKENDS, DEFAULT_BACKEND, INCREMENTAL_BACKEND, make_backend
+from skill_normalization import normalize_skills_list
+
+# Bump whenever the artifact layout or the training recipe changes.
+ARTIFACT_VERSION = 4
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, "final.csv")
+ARTIFACT_DIR = os.path.join(BASE_DIR, "Model", "artifacts")
+
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+# Builds kept per backend, CURRENT included; older ones are deleted on publish.
+KEEP_BUILDS = int(os.environ.get("SKILLFIT_KEEP_BUILDS", "5"))
+ARTIFACT_FILES = {
+    "vectorizer": "vectorizer.joblib",
+    "model": "model.joblib",
+    "label_encoder": "label_encoder.joblib",
+    "gap_index": "gap_index.joblib",
+}
+
+
+# ---------------------- DATASET ----------------------
+def dataset_checksum(path=DATASET_PATH):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def load_training_data(path=DATASET_PATH):
+    # The columnar store (skill_store.py) skips the per-row list parsing, but
+    # only if it was built from exactly this CSV. Imported here because
+    # skill_store publishes its builds through this module.
+    from skill_store import open_store_for
+
+    store = open_store_for(path)
+    if store is not None:
+        return store.training_frame()
+    return prepare_training_data(pd.read_csv(path))
+
+def prepare_training_data(df):
+    # Job-posting exports (final_synthetic_job_postings.csv) name the columns differently.
+    df = df.rename(columns={"Job Title": "Role", "Required Skills": "Skills"})
+
+    # Remove duplicates
+    df.drop_duplicates(inplace=True)
+
+    # Convert stringified list to actual list and normalize each skill
+    df['Skills'] = df['Skills'].apply(ast.literal_eval)
+    df['Skills'] = df['Skills'].apply(normalize_skills_list)
+
+    # Join normalized list back to space-separated string for vectorizer
+    df['Skills_str'] = df['Skills'].apply(lambda x: ' '.join(x))
+    df['Combined_Label'] = df['Role'].str.strip() + " || " + df['Domain'].str.strip()
+    return df
+
+
+# ---------------------- TRAINING ----------------------
+def train(df, evaluate=False, backend=DEFAULT_BACKEND):
+    le_combined = LabelEncoder()
+    y_combined = le_combined.fit_transform(df['Combined_Label'])
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 3))
+    X = vectorizer.fit_transform(df['Skills_str'])
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y_combined, test_size=0.2, random_state=42)
+
+    model = make_backend(backend)
+    model.fit(X_train, y_train)
+
+    if evaluate:
+        y_pred = model.predict(X_test)
+        labels_in_test = unique_labels(y_test, y_pred)
+        target_names = le_combined.inverse_transform(labels_in_test)
+        print(classification_report(y_test, y_pred, labels=labels_in_test, target_names=target_names))
+
+    return {
+        "backend": backend,
+        "vectorizer": vectorizer,
+        "model": model,
+        "label_encoder": le_combined,
+        "gap_index": SkillGapIndex.from_dataframe(df),
+    }
+
+
+# ---------------------- SAVE / PUBLISH ----------------------
+def backend_dir(artifact_dir, backend):
+    return os.path.join(artifact_dir, backend)
+
+def save_artifacts(artifacts, dataset_sha256, artifact_dir=ARTIFACT_DIR, files=ARTIFACT_FILES, manifest_extra=None):
+    artifact_dir = backend_dir(artifact_dir, artifacts["backend"])
+    os.makedirs(artifact_dir, exist_ok=True)
+    base_id = time.strftime("%Y%m%d-%H%M%S") + "-" + dataset_sha256[:12]
+    staging = tempfile.mkdtemp(prefix=".build-", dir=artifact_dir)
+    try:
+        for key, filename in files.items():
+            # No compression: compressed pickles cannot be memory-mapped on load.
+            joblib.dump(artifacts[key], os.path.join(staging, filename))
+        manifest = {
+            "artifact_version": ARTIFACT_VERSION,
+            "backend": artifacts["backend"],
+            "build_id": base_id,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "dataset_sha256": dataset_sha256,
+            "sklearn_version": sklearn.__version__,
+            "n_classes": int(len(artifacts["label_encoder"].classes_)),
+            "files": files,
+            **(manifest_extra or {}),
+        }
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    def write_manifest(build_id):
+        manifest["build_id"] = build_id
+        with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    return publish_build(artifact_dir, staging, base_id, write_manifest)
+
+def publish_build(parent_dir, staging, base_id, write_meta, meta_file=MANIFEST_FILE):
+    """
+    Move a fully written staging directory into parent_dir as a new build,
+    point CURRENT at it and prune old builds; returns the build directory.
+    write_meta(build_id) writes the build's metadata file into staging.
+    """
+    try:
+        # Two publishes in the same second get -2, -3, ...: an existing build
+        # may be live, so it is never replaced.
+        for n in itertools.count(1):
+            build_id = base_id if n == 1 else f"{base_id}-{n}"
+            write_meta(build_id)
+            final_dir = os.path.join(parent_dir, build_id)
+            try:
+                os.rename(staging, final_dir)
+                break
+            except OSError:
+                if not os.path.isdir(final_dir):
+                    raise
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Flip the pointer last so readers only ever see a complete build.
+    set_current(parent_dir, build_id)
+    prune_builds(parent_dir, meta_file=meta_file)
+    return final_dir
+
+def set_current(parent_dir, build_id):
+    pointer_tmp = os.path.join(parent_dir, f".{CURRENT_FILE}.{os.getpid()}")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(build_id)
+    os.replace(pointer_tmp, os.path.join(parent_dir, CURRENT_FILE))
+
+def prune_builds(parent_dir, keep=None, meta_file=MANIFEST_FILE):
+    """Delete all but the `keep` (KEEP_BUILDS) newest complete builds in parent_dir; CURRENT is always kept."""
+    keep = KEEP_BUILDS if keep is None else keep
+    current = read_current(parent_dir)
+    builds = []
+    for name in os.listdir(parent_dir):
+        meta = os.path.join(parent_dir, name, meta_file)
+        # Staging directories start with "." and have no place in the order.
+        if not name.startswith(".") and os.path.isfile(meta):
+            builds.append((os.path.getmtime(meta), name))
+    for _, name in sorted(builds, reverse=True)[max(keep, 1):]:
+        if name != current:
+            shutil.rmtree(os.path.join(parent_dir, name), ignore_errors=True)
+
+
+# ---------------------- LOAD ----------------------
+def read_current(parent_dir):
+    # Build id CURRENT points at, or None.
+    try:
+        with open(os.path.join(parent_dir, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def current_build_dir(artifact_dir=ARTIFACT_DIR, backend=DEFAULT_BACKEND):
+    artifact_dir = backend_dir(artifact_dir, backend)
+    build_id = read_current(artifact_dir)
+    build_dir = os.path.join(artifact_dir, build_id) if build_id else None
+    return build_dir if build_dir and os.path.isdir(build_dir) else None
+
+def read_manifest(build_dir):
+    with open(os.path.join(build_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def is_stale(manifest, dataset_sha256):
+    # Incremental builds are not tied to one final.csv; they only ever grow.
+    return (
+        manifest.get("artifact_version") != ARTIFACT_VERSION
+        or (not manifest.get("incremental") and manifest.get("dataset_sha256") != dataset_sha256)
+        or manifest.get("sklearn_version") != sklearn.__version__
+    )
+
+def load_artifacts(artifact_dir=ARTIFACT_DIR, dataset_path=DATASET_PATH, mmap_mode="r", backend=DEFAULT_BACKEND):
+    """
+    Load the current build, or return None if it is missing or stale.
+    With mmap_mode='r' plain numpy arrays (idf weights, gap index) are mapped
+    read-only from disk and shared through the page cache; forest node arrays
+    are copied into each process regardless (see the header).
+    """
+    build_dir = current_build_dir(artifact_dir, backend)
+    if build_dir is None:
+        return None
+    try:
+        manifest = read_manifest(build_dir)
+    except (OSError, ValueError):
+        return None
+    if os.path.exists(dataset_path) and is_stale(manifest, dataset_checksum(dataset_path)):
+        return None
+
+    artifacts = {"manifest": manifest, "backend": backend}
+    for key, filename in manifest["files"].items():
+        artifacts[key] = joblib.load(os.path.join(build_dir, filename), mmap_mode=mmap_mode)
+    return artifacts
+
+def build(dataset_path=DATASET_PATH, artifact_dir=ARTIFACT_DIR, evaluate=True, backend=DEFAULT_BACKEND):
+    df = load_training_data(dataset_path)
+    artifacts = train(df, evaluate=evaluate, backend=backend)
+    build_dir = save_artifacts(artifacts, dataset_checksum(dataset_path), artifact_dir)
+    artifacts["manifest"] = read_manifest(build_dir)
+    return artifacts
+
+def load_or_train(artifact_dir=ARTIFACT_DIR, dataset_path=DATASET_PATH, backend=DEFAULT_BACKEND):
+    artifacts = load_artifacts(artifact_dir, dataset_path, backend=backend)
+    if artifacts is not None:
+        return artifacts
+    if backend == INCREMENTAL_BACKEND:
+        from incremental_training import bootstrap
+        return bootstrap(dataset_path, artifact_dir)
+
+    # Missing or stale: train in-process, and try to persist the result so the
+    # next worker start can skip this. A read-only deploy just keeps training.
+    df = load_training_data(dataset_path)
+    artifacts = train(df, backend=backend)
+    try:
+        build_dir = save_artifacts(artifacts, dataset_checksum(dataset_path), artifact_dir)
+        artifacts["manifest"] = read_manifest(build_dir)
+    except OSError as e:
+        print(f"Could not save model artifacts: {e}")
+        artifacts["manifest"] = None
+    return artifacts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build role/domain predictor artifacts.")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--out", default=ARTIFACT_DIR)
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=sorted(BACKENDS))
+    parser.add_argument("--force", action="store_true", help="rebuild even if the current build is up to date")
+    args = parser.parse_args()
+
+    if not args.force and load_artifacts(args.out, args.dataset, backend=args.backend) is not None:
+        print(f"Artifacts in {current_build_dir(args.out, args.backend)} are up to date (use --force to rebuild).")
+    else:
+        artifacts = build(args.dataset, args.out, backend=args.backend)
+        print(f"Built {args.backend} {artifacts['manifest']['build_id']} in {backend_dir(args.out, args.backend)}")
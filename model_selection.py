@@ -0,0 +1,276 @@
+# model_selection.py
+# Parallel, reproducible model selection for the role/domain predictor.
+#
+#   python model_selection.py                                  # full grid, 5-fold CV, all cores
+#   python model_selection.py --search random --n-iter 8 --seed 7
+#   python model_selection.py --backends linear centroid --ngram-ranges 1-1 1-2 --folds 3
+#   python model_selection.py --export --json selection_report.json
+#
+# Candidates are a TF-IDF n-gram range plus one of the inference backends and
+# its hyper-parameters (SEARCH_SPACE). Every candidate is scored with the same
+# stratified K folds. The vectorizer is fitted once per (n-gram range, fold)
+# and those matrices are shared by every candidate that uses them, so the
+# grid never refits TF-IDF. Fold fits run in parallel with joblib (--jobs).
+#
+# Per candidate: mean top-1 / top-k accuracy, fit and predict wall time,
+# peak memory of one fit (RSS growth on the first fold, each fit in a fresh
+# process; skip with --no-memory) and pickled model size. --export refits
+# the best candidate on the whole dataset and publishes it as a versioned build
+# (model_artifacts.save_artifacts) with the search and its metrics in the
+# manifest. Same seed, same data -> same folds, samples and forests.
+import argparse
+import io
+import itertools
+import json
+import multiprocessing
+import random
+import time
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import LabelEncoder
+
+from compare_backends import top_k_accuracy
+from gap_index import SkillGapIndex
+from inference_backends import make_backend
+from model_artifacts import ARTIFACT_DIR, DATASET_PATH, dataset_checksum, load_training_data, read_manifest, save_artifacts
+
+NGRAM_RANGES = [(1, 1), (1, 2), (1, 3)]
+# backend -> hyper-parameter grid (set_params names)
+SEARCH_SPACE = {
+    "forest": {"n_estimators": [50, 150, 300], "max_depth": [None, 40]},
+    "linear": {"C": [1.0, 10.0]},
+    # temperature only sharpens the softmax, never the ranking: nothing to tune
+    "centroid": {},
+}
+
+
+# ---------------------- CANDIDATES ----------------------
+def candidates(backends=tuple(SEARCH_SPACE), ngram_ranges=NGRAM_RANGES):
+    """Every (n-gram range, backend, params) combination, in a fixed order."""
+    out = []
+    for ngram_range in ngram_ranges:
+        for backend in backends:
+            grid = SEARCH_SPACE[backend]
+            for values in itertools.product(*grid.values()):
+                out.append({"ngram_range": tuple(ngram_range), "backend": backend, "params": dict(zip(grid, values))})
+    return out
+
+def sample(grid, n_iter, seed):
+    # Random search: n_iter distinct candidates, reproducible for a seed.
+    if n_iter >= len(grid):
+        return grid
+    picked = sorted(random.Random(seed).sample(range(len(grid)), n_iter))
+    return [grid[i] for i in picked]
+
+def describe(candidate):
+    params = ", ".join(f"{k}={v}" for k, v in candidate["params"].items())
+    low, high = candidate["ngram_range"]
+    return f"{candidate['backend']}({params}) ngram {low}-{high}"
+
+def make_model(candidate, seed):
+    model = make_backend(candidate["backend"]).set_params(**candidate["params"])
+    if "random_state" in model.get_params():
+        model.set_params(random_state=seed)
+    if candidate["backend"] == "forest":
+        model.set_params(n_jobs=1)      # parallelism is across fits, not inside one
+    return model
+
+
+# ---------------------- FOLD WORK ----------------------
+def vectorize_fold(ngram_range, texts, train_idx, test_idx):
+    start = time.perf_counter()
+    vectorizer = TfidfVectorizer(ngram_range=ngram_range)
+    X_train = vectorizer.fit_transform(texts[train_idx])
+    X_test = vectorizer.transform(texts[test_idx])
+    return X_train, X_test, time.perf_counter() - start
+
+def model_size(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.tell()
+
+def evaluate_fold(candidate, seed, X_train, y_train, X_test, y_test, k):
+    model = make_model(candidate, seed)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    probs = model.predict_proba(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        "top1": top_k_accuracy(probs, model.classes_, y_test, 1),
+        f"top{k}": top_k_accuracy(probs, model.classes_, y_test, k),
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "model_bytes": model_size(model),
+    }
+
+def _proc_status_mb(field):
+    with open("/proc/self/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+
+def fit_peak_mb(candidate, seed, X_train, y_train):
+    # Peak RSS growth over one fit. Runs in a fresh process (see
+    # measure_peak_memory); resets the kernel's high-water mark first, since
+    # a spawned child inherits its parent's. None where /proc is missing.
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        before = _proc_status_mb("VmRSS")
+    except OSError:
+        return None
+    make_model(candidate, seed).fit(X_train, y_train)
+    return _proc_status_mb("VmHWM") - before
+
+def measure_peak_memory(grid, matrices, y, splits, seed, n_jobs):
+    """Peak fit memory of each candidate on the first fold, one fresh process per fit."""
+    # Native buffers (forest tree nodes, liblinear) are invisible to
+    # tracemalloc and a reused worker's RSS only ever grows, so each fit
+    # gets its own interpreter.
+    pool = multiprocessing.get_context("spawn").Pool(effective_n_jobs(n_jobs), maxtasksperchild=1)
+    try:
+        return pool.starmap(fit_peak_mb, [
+            (candidate, seed, matrices[candidate["ngram_range"], 0][0], y[splits[0][0]]) for candidate in grid
+        ], chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+# ---------------------- SEARCH ----------------------
+def run_search(grid, df, folds=5, k=5, seed=42, n_jobs=-1, measure_memory=True, verbose=0):
+    texts = np.asarray(df['Skills_str'].tolist(), dtype=object)
+    y = LabelEncoder().fit_transform(df['Combined_Label'])
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(texts, y))
+    parallel = Parallel(n_jobs=n_jobs, verbose=verbose)
+
+    # One TF-IDF fit per (n-gram range, fold), shared by every candidate.
+    ngram_ranges = sorted({c["ngram_range"] for c in grid})
+    fold_data = parallel(
+        delayed(vectorize_fold)(ngram_range, texts, train_idx, test_idx)
+        for ngram_range in ngram_ranges for train_idx, test_idx in splits
+    )
+    matrices = {
+        (ngram_range, fold): fold_data[i * folds + fold]
+        for i, ngram_range in enumerate(ngram_ranges) for fold in range(folds)
+    }
+
+    tasks = [(c, fold) for c in grid for fold in range(folds)]
+    fold_results = parallel(
+        delayed(evaluate_fold)(
+            candidate, seed,
+            matrices[candidate["ngram_range"], fold][0], y[splits[fold][0]],
+            matrices[candidate["ngram_range"], fold][1], y[splits[fold][1]],
+            k,
+        )
+        for candidate, fold in tasks
+    )
+    peaks = measure_peak_memory(grid, matrices, y, splits, seed, n_jobs) if measure_memory else [None] * len(grid)
+
+    rows = []
+    for i, candidate in enumerate(grid):
+        per_fold = fold_results[i * folds:(i + 1) * folds]
+        vectorize_seconds = np.mean([matrices[candidate["ngram_range"], f][2] for f in range(folds)])
+        rows.append({
+            "candidate": describe(candidate),
+            "backend": candidate["backend"],
+            "ngram_range": list(candidate["ngram_range"]),
+            "params": candidate["params"],
+            "top1_accuracy": float(np.mean([r["top1"] for r in per_fold])),
+            "top1_std": float(np.std([r["top1"] for r in per_fold])),
+            f"top{k}_accuracy": float(np.mean([r[f"top{k}"] for r in per_fold])),
+            "vectorize_seconds": float(vectorize_seconds),
+            "fit_seconds": float(np.mean([r["fit_seconds"] for r in per_fold])),
+            "predict_seconds": float(np.mean([r["predict_seconds"] for r in per_fold])),
+            "wall_seconds": float(vectorize_seconds + np.mean([r["fit_seconds"] + r["predict_seconds"] for r in per_fold])),
+            "peak_mb": peaks[i],
+            "model_size_mb": float(np.mean([r["model_bytes"] for r in per_fold])) / 1e6,
+        })
+    return rows
+
+def best_candidate(rows, k=5):
+    # Highest top-1, then top-k; faster to fit breaks the remaining ties.
+    return max(rows, key=lambda r: (round(r["top1_accuracy"], 4), round(r[f"top{k}_accuracy"], 4), -r["fit_seconds"]))
+
+
+# ---------------------- EXPORT ----------------------
+def export(row, df, dataset_path, seed, search, artifact_dir=ARTIFACT_DIR):
+    """Refit the chosen candidate on the whole dataset and publish it as a build of its backend."""
+    candidate = {"ngram_range": tuple(row["ngram_range"]), "backend": row["backend"], "params": row["params"]}
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(df['Combined_Label'])
+    vectorizer = TfidfVectorizer(ngram_range=candidate["ngram_range"])
+    model = make_model(candidate, seed).fit(vectorizer.fit_transform(df['Skills_str']), y)
+    artifacts = {
+        "backend": candidate["backend"],
+        "vectorizer": vectorizer,
+        "model": model,
+        "label_encoder": label_encoder,
+        "gap_index": SkillGapIndex.from_dataframe(df),
+    }
+    build_dir = save_artifacts(artifacts, dataset_checksum(dataset_path), artifact_dir,
+                               manifest_extra={"selection": {**search, "chosen": row}})
+    artifacts["manifest"] = read_manifest(build_dir)
+    return artifacts
+
+
+def print_report(rows, k=5):
+    header = f"{'candidate':<52}{'top1':>7}{'±':>6}{f'top{k}':>7}{'wall s':>8}{'fit s':>8}{'peak MB':>9}{'size MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in sorted(rows, key=lambda r: -r["top1_accuracy"]):
+        peak = "-" if r["peak_mb"] is None else f"{r['peak_mb']:.1f}"
+        print(f"{r['candidate']:<52}{r['top1_accuracy']:>7.3f}{r['top1_std']:>6.3f}{r[f'top{k}_accuracy']:>7.3f}"
+              f"{r['wall_seconds']:>8.2f}{r['fit_seconds']:>8.2f}{peak:>9}{r['model_size_mb']:>9.2f}")
+
+
+def ngram_range_arg(text):
+    low, _, high = text.partition("-")
+    return (int(low), int(high or low))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validated model selection for the role/domain predictor.")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--n-iter", type=int, default=10, help="candidates to sample with --search random")
+    parser.add_argument("--backends", nargs="+", default=list(SEARCH_SPACE), choices=list(SEARCH_SPACE))
+    parser.add_argument("--ngram-ranges", nargs="+", type=ngram_range_arg, default=NGRAM_RANGES, metavar="LOW-HIGH")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("-k", type=int, default=5, help="report top-k accuracy for this k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fits (-1: all cores)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--export", action="store_true", help="publish the best candidate as a model build")
+    parser.add_argument("--out", default=ARTIFACT_DIR)
+    parser.add_argument("--json", help="also write every candidate's metrics to this JSON file")
+    args = parser.parse_args()
+
+    grid = candidates(args.backends, args.ngram_ranges)
+    if args.search == "random":
+        grid = sample(grid, args.n_iter, args.seed)
+    df = load_training_data(args.dataset)
+    print(f"{len(grid)} candidates x {args.folds} folds on {len(df)} rows")
+
+    start = time.perf_counter()
+    rows = run_search(grid, df, args.folds, args.k, args.seed, args.jobs, not args.no_memory)
+    print_report(rows, args.k)
+    best = best_candidate(rows, args.k)
+    print(f"\nBest: {best['candidate']} (top-1 {best['top1_accuracy']:.3f}) in {time.perf_counter() - start:.1f}s")
+
+    search = {"search": args.search, "folds": args.folds, "k": args.k, "seed": args.seed,
+              "n_candidates": len(grid), "dataset_sha256": dataset_checksum(args.dataset)}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**search, "best": best, "candidates": rows}, f, indent=2)
+    if args.export:
+        artifacts = export(best, df, args.dataset, args.seed, search, args.out)
+        print(f"Published {artifacts['backend']} build {artifacts['manifest']['build_id']}")
@@ -0,0 +1,228 @@
+# posting_search.py
+# Best matching job postings for a set of skills.
+#
+#   python posting_search.py                                    # build Model/search/<dataset>/
+#   python posting_search.py --skills "python, sql, tableau" -k 5 --demand High
+#
+# Every posting of final_synthetic_job_postings.csv becomes one row of a CSR
+# matrix over the normalized skill vocabulary (idf-weighted, rows L2
+# normalized), so a query is a sparse matrix-vector product: the cosine
+# similarity of each posting's skills with the user's. The matrix is scored
+# in row blocks and only a k-sized heap survives between blocks, so memory
+# stays bounded by the block size however many postings there are. Filters
+# (domain / demand level / qualification) are checked per block against the
+# skill store's category codes.
+#
+# The index sits next to the skill store it was built from, one build per
+# directory under Model/search/<dataset>/ behind a CURRENT pointer (see
+# model_artifacts.publish_build); it is memory-mapped on load and rebuilt when
+# the dataset changes.
+import argparse
+import heapq
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from model_artifacts import publish_build, read_current
+from skill_normalization import normalize_skills_list
+from skill_store import BASE_DIR, convert, open_store, open_store_for
+
+POSTINGS_PATH = os.path.join(BASE_DIR, "final_synthetic_job_postings.csv")
+SEARCH_DIR = os.path.join(BASE_DIR, "Model", "search")
+INDEX_VERSION = 2
+INDEX_META = "index.json"
+BLOCK_ROWS = 65_536
+
+# filter keyword -> dataset column
+FILTERS = {"domain": "Domain", "demand": "Demand Level", "qualification": "Qualification"}
+# result field -> dataset column
+FIELDS = {"title": "Job Title", "domain": "Domain", "qualification": "Qualification",
+          "demand": "Demand Level", "salary": "Salary Range"}
+
+
+# ---------------------- BUILD ----------------------
+def build_index(csv_path=POSTINGS_PATH, search_dir=SEARCH_DIR):
+    """Vectorize every distinct posting; returns the index directory."""
+    store = open_store_for(csv_path) or open_store(convert(csv_path))
+    to_norm, vocabulary = store.normalized_vocabulary()
+    rows = np.flatnonzero(store.keep)
+
+    # One entry per distinct normalized skill of each posting.
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indices = []
+    for i, row in enumerate(rows):
+        ids = np.unique(to_norm[store.skill_ids[store.offsets[row]:store.offsets[row + 1]]])
+        indices.append(ids)
+        indptr[i + 1] = indptr[i] + len(ids)
+    indices = np.concatenate(indices).astype(np.int32) if indices else np.empty(0, np.int32)
+
+    df = np.bincount(indices, minlength=len(vocabulary))
+    idf = (np.log((1 + len(rows)) / (1 + df)) + 1).astype(np.float32)
+    data = idf[indices]
+    # Per-row norms; reduceat would misread postings without skills.
+    row_of = np.repeat(np.arange(len(rows)), np.diff(indptr))
+    norms = np.sqrt(np.bincount(row_of, data.astype(np.float64) ** 2, minlength=len(rows)))
+    data /= np.where(norms > 0, norms, 1)[row_of].astype(np.float32)
+
+    parent = index_dir(csv_path, search_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".search-", dir=parent)
+    try:
+        for name, array in (("data", data), ("indices", indices), ("indptr", indptr), ("rows", rows), ("idf", idf)):
+            np.save(os.path.join(staging, f"{name}.npy"), array)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    def write_meta(build_id):
+        meta = {
+            "index_version": INDEX_VERSION,
+            "build_id": build_id,
+            "source": os.path.basename(csv_path),
+            "source_sha256": store.meta["source_sha256"],
+            "postings": len(rows),
+            "vocabulary": list(vocabulary),
+        }
+        with open(os.path.join(staging, INDEX_META), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    base_id = time.strftime("%Y%m%d-%H%M%S") + "-" + store.meta["source_sha256"][:12]
+    return publish_build(parent, staging, base_id, write_meta, INDEX_META)
+
+def index_dir(csv_path, search_dir=SEARCH_DIR):
+    # Holds the dataset's index builds and the CURRENT pointer.
+    return os.path.join(search_dir, os.path.splitext(os.path.basename(csv_path))[0])
+
+
+# ---------------------- SEARCH ----------------------
+class PostingIndex:
+    def __init__(self, path, store, mmap_mode="r"):
+        with open(os.path.join(path, INDEX_META), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        load = lambda name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+        self.data = load("data")
+        self.indices = load("indices")
+        self.indptr = load("indptr")
+        self.rows = load("rows")        # matrix row -> skill store row
+        self.idf = load("idf")
+        self.skill_ids = {s: i for i, s in enumerate(self.meta["vocabulary"])}
+        self.store = store
+
+    def __len__(self):
+        return self.meta["postings"]
+
+    def query_vector(self, skills):
+        q = np.zeros(len(self.skill_ids), dtype=np.float32)
+        ids = [self.skill_ids[s] for s in set(normalize_skills_list(skills)) if s in self.skill_ids]
+        q[ids] = self.idf[ids]
+        norm = np.linalg.norm(q)
+        return q / norm if norm else q
+
+    def _allowed_codes(self, column, values):
+        # Category codes of the requested values (a string or a list of them).
+        values = [values] if isinstance(values, str) else values
+        categories = {c.lower(): i for i, c in enumerate(self.store.meta["categories"][column])}
+        return np.array([categories[v.lower()] for v in values if v.lower() in categories], dtype=np.int32)
+
+    def top_k(self, skills, k=10, block_rows=BLOCK_ROWS, **filters):
+        """
+        [(score, matrix row)] of the k postings most similar to skills, best
+        first. Keyword filters (domain=, demand=, qualification=) take a value
+        or a list of values, matched case-insensitively.
+        """
+        q = self.query_vector(skills)
+        if k <= 0 or not q.any():
+            return []
+        allowed = {}
+        for key, values in filters.items():
+            if values:
+                allowed[FILTERS[key]] = self._allowed_codes(FILTERS[key], values)
+
+        heap = []                       # (score, -row): the k best so far, worst on top
+        for start in range(0, len(self), block_rows):
+            stop = min(start + block_rows, len(self))
+            a, b = self.indptr[start], self.indptr[stop]
+            block = csr_matrix(
+                (self.data[a:b], self.indices[a:b], self.indptr[start:stop + 1] - a),
+                shape=(stop - start, len(q)),
+            )
+            scores = block @ q
+            if allowed:
+                store_rows = self.rows[start:stop]
+                for column, codes in allowed.items():
+                    scores[~np.isin(self.store.codes[column][store_rows], codes)] = 0
+            best = np.flatnonzero(scores > 0)
+            if len(best) > k:
+                kth = np.partition(scores[best], len(best) - k)[len(best) - k]
+                best = best[scores[best] >= kth]       # keeps ties at the cut
+            for i in best:
+                item = (float(scores[i]), -(start + int(i)))   # ties go to the earlier posting
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return [(score, -neg_row) for score, neg_row in sorted(heap, reverse=True)]
+
+    def search(self, skills, k=10, **filters):
+        """Top-k postings as dicts: posting fields, score, matched and missing skills."""
+        user = set(normalize_skills_list(skills))
+        results = []
+        for score, row in self.top_k(skills, k, **filters):
+            store_row = int(self.rows[row])
+            posting = {field: self.store.meta["categories"][column][self.store.codes[column][store_row]]
+                       for field, column in FIELDS.items()}
+            required = sorted(set(normalize_skills_list(self.store.row_skills(store_row))))
+            posting.update(
+                score=round(score, 4),
+                matched=[s for s in required if s in user],
+                missing=[s for s in required if s not in user],
+            )
+            results.append(posting)
+        return results
+
+    def filter_values(self):
+        # Choices for each filter, as they appear in the dataset.
+        return {key: sorted(self.store.meta["categories"][column]) for key, column in FILTERS.items()}
+
+
+def open_index(csv_path=POSTINGS_PATH, search_dir=SEARCH_DIR):
+    """The posting index for csv_path, (re)built first if missing or out of date."""
+    store = open_store_for(csv_path) or open_store(convert(csv_path))
+    parent = index_dir(csv_path, search_dir)
+    build_id = read_current(parent)
+    path = os.path.join(parent, build_id) if build_id else None
+    try:
+        with open(os.path.join(path, INDEX_META), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (TypeError, OSError, ValueError):
+        meta = {}
+    if meta.get("index_version") != INDEX_VERSION or meta.get("source_sha256") != store.meta["source_sha256"]:
+        path = build_index(csv_path, search_dir)
+    return PostingIndex(path, store)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the job posting index, or query it.")
+    parser.add_argument("dataset", nargs="?", default=POSTINGS_PATH)
+    parser.add_argument("--out", default=SEARCH_DIR)
+    parser.add_argument("--skills", help="comma-separated skills to search with")
+    parser.add_argument("-k", type=int, default=10)
+    for key in FILTERS:
+        parser.add_argument(f"--{key}", action="append", help=f"only postings with this {FILTERS[key]} (repeatable)")
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    index = open_index(args.dataset, args.out)
+    print(f"{len(index)} postings, {len(index.skill_ids)} skills ({time.perf_counter() - t:.3f}s to open)")
+    if args.skills:
+        t = time.perf_counter()
+        results = index.search([s.strip() for s in args.skills.split(",")], args.k,
+                               **{key: getattr(args, key) for key in FILTERS})
+        print(f"top {len(results)} in {(time.perf_counter() - t) * 1000:.1f} ms")
+        for r in results:
+            print(f"  {r['score']:.3f}  {r['title']} | {r['domain']} | {r['qualification']} | "
+                  f"{r['demand']} demand | {r['salary']}  matched: {', '.join(r['matched'])}")
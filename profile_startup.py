@@ -0,0 +1,95 @@
+# profile_startup.py
+# Cold-start profile of the Streamlit app: import-time breakdown and
+# time-to-first-render of the landing page, checked against a budget.
+#
+#   python profile_startup.py                   # report only
+#   python profile_startup.py --budget 1.0      # exit 1 if the landing page takes longer
+#
+# Runs the app once in a fresh interpreter (Streamlit's AppTest, no upload)
+# under `python -X importtime`, so nothing is warm from a previous run.
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MARKER = "---- skillfit app run ----"
+END_MARKER = "---- skillfit app rendered ----"
+
+CHILD = f"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({os.path.join(ROOT, "app.py")!r}, default_timeout=300)
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+sys.stderr.write({END_MARKER!r} + "\\n")
+errors = [e.message for e in at.exception]
+print(json.dumps({{"first_render_s": elapsed, "errors": errors}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr):
+    # Top-level imports made while the landing page rendered, with cumulative
+    # seconds. The background model warm-up may contribute a few of these.
+    during_run = stderr.split(MARKER, 1)[-1].split(END_MARKER, 1)[0]
+    modules = []
+    for line in during_run.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if m and len(m.group(3)) <= 1:
+            modules.append((m.group(4), int(m.group(2)) / 1e6))
+    return modules
+
+
+def profile():
+    env = dict(os.environ, SKILLFIT_PROFILE_STARTUP="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=ROOT, capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"App run failed with exit code {proc.returncode}")
+    # The app and its dependencies may print too; the result is the JSON line.
+    result_line = [line for line in proc.stdout.splitlines() if line.startswith('{"first_render_s"')][-1]
+    result = json.loads(result_line)
+    result["imports"] = parse_importtime(proc.stderr)
+    result["import_s"] = sum(seconds for _, seconds in result["imports"])
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile SkillFit cold start.")
+    parser.add_argument("--budget", type=float, help="max seconds allowed for the first landing-page render")
+    parser.add_argument("--top", type=int, default=15, help="how many of the slowest imports to list")
+    parser.add_argument("--json", help="write the full profile to this file")
+    args = parser.parse_args(argv)
+
+    result = profile()
+    print(f"Time to first render: {result['first_render_s'] * 1000:8.1f} ms")
+    print(f"  of which imports:   {result['import_s'] * 1000:8.1f} ms")
+    print("\nSlowest top-level imports during the first run:")
+    for name, seconds in sorted(result["imports"], key=lambda m: -m[1])[:args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    if result["errors"]:
+        print("\nApp raised:", *result["errors"], sep="\n  ")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if result["errors"]:
+        return 1
+    if args.budget is not None and result["first_render_s"] > args.budget:
+        print(f"\nOver budget: {result['first_render_s']:.2f}s > {args.budget:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# result_cache.py
+# Content-addressed cache for per-resume analysis results.
+#
+# Key = sha256(PDF bytes) + model build + skills.json checksum, so a new model
+# or vocabulary never serves stale results. Two tiers:
+#   - in-memory LRU with a size cap and TTL (per process)
+#   - optional SQLite file shared by every worker process on the host
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+_file_checksums = {}
+
+def file_checksum(path):
+    # Hash once per (path, mtime) rather than on every lookup.
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _file_checksums.get(key)
+    if cached is None or cached[0] != mtime:
+        with open(key, "rb") as f:
+            cached = (mtime, sha256_bytes(f.read()))
+        _file_checksums[key] = cached
+    return cached[1]
+
+def cache_key(pdf_bytes, model_version, skills_version):
+    return f"{sha256_bytes(pdf_bytes)}:{model_version}:{skills_version}"
+
+
+class ResultCache:
+    def __init__(self, max_entries=256, ttl=3600, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self._memory = OrderedDict()     # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        if db_path:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, stored_at REAL, value TEXT)")
+
+    def _connect(self):
+        # Short-lived connections: sqlite3 objects can't be shared across threads.
+        # `with conn:` only commits, so callers wrap it in closing() as well.
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _count(self, name):
+        self._counters[name] += 1
+
+    # ---------------------- MEMORY TIER ----------------------
+    def _memory_get(self, key, now):
+        item = self._memory.get(key)
+        if item is None:
+            return None
+        stored_at, value = item
+        if now - stored_at > self.ttl:
+            del self._memory[key]
+            self._count("expired")
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_put(self, key, value, stored_at):
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._count("evictions")
+
+    # ---------------------- DISK TIER ----------------------
+    def _disk_get(self, key, now):
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT stored_at, value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[0] > self.ttl:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    with self._lock:
+                        self._count("expired")
+                    row = None
+        except sqlite3.Error as e:
+            print(f"Result cache read failed: {e}")
+            return None
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def _disk_put(self, key, value, stored_at):
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, stored_at, value) VALUES (?, ?, ?)",
+                    (key, stored_at, json.dumps(value)),
+                )
+        except sqlite3.Error as e:
+            print(f"Result cache write failed: {e}")
+
+    # ---------------------- PUBLIC ----------------------
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            value = self._memory_get(key, now)
+            if value is not None:
+                self._count("memory_hits")
+                return value
+        if self.db_path:
+            found = self._disk_get(key, now)
+            if found is not None:
+                stored_at, value = found
+                with self._lock:
+                    self._memory_put(key, value, stored_at)
+                    self._count("disk_hits")
+                return value
+        with self._lock:
+            self._count("misses")
+        return None
+
+    def put(self, key, value):
+        # value must be JSON-serializable when the disk tier is enabled.
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, value, now)
+        if self.db_path:
+            self._disk_put(key, value, now)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM results")
+
+
+def cache_from_env():
+    return ResultCache(
+        max_entries=int(os.environ.get("SKILLFIT_CACHE_SIZE", 256)),
+        ttl=float(os.environ.get("SKILLFIT_CACHE_TTL", 3600)),
+        db_path=os.environ.get("SKILLFIT_CACHE_DB") or None,
+    )
@@ -0,0 +1,288 @@
+# skill_market.py
+# Market value of skills, from the postings in final_synthetic_job_postings.csv:
+# how many postings ask for a skill, how in demand they are and what they pay.
+#
+#   python skill_market.py                          # build Model/market/ from the postings dataset
+#   python skill_market.py --ingest new_postings.csv
+#
+# Aggregates are kept per skill and per (skill, domain) as plain counts, so
+# new postings only add to them:
+#   postings      postings listing the key
+#   demand        of those, how many per demand level (Low / Medium / High)
+#   salary        histogram of salary-range midpoints in SALARY_BIN buckets
+# Percentiles and demand shares are derived from the counts once per load or
+# update, so ranking a gap list is one dict lookup per skill. Salary ranges
+# are parsed once per distinct string. As in incremental_training.py, every
+# posting is identified by a hash, so re-ingesting a grown file only adds
+# the new rows.
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from model_artifacts import load_training_data, publish_build, read_current
+from skill_normalization import normalize_skills_list
+from skill_store import BASE_DIR, file_sha256
+
+POSTINGS_PATH = os.path.join(BASE_DIR, "final_synthetic_job_postings.csv")
+MARKET_DIR = os.path.join(BASE_DIR, "Model", "market")
+MARKET_VERSION = 2
+MARKET_META = "market.json"
+
+DEMAND_LEVELS = ("low", "medium", "high")
+SALARY_BIN = 2_500
+SALARY_BINS = 240                   # $0 - $600k; higher midpoints land in the last bin
+PERCENTILES = (25, 50, 75)
+MIN_DOMAIN_POSTINGS = 5             # fewer than this in a domain -> use the skill's overall numbers
+ALL_DOMAINS = ""
+
+_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+
+def parse_salary(text):
+    """Midpoint of "$90,000 - $120,000" (or "90k-120k", "$75,000"), or None."""
+    amounts = [float(n.replace(",", "")) * (1000 if k else 1) for n, k in _AMOUNT.findall(str(text))]
+    return sum(amounts[:2]) / len(amounts[:2]) if amounts else None
+
+def posting_digests(df):
+    # 64-bit id per posting: title, domain, skill set, demand and salary.
+    digests = np.empty(len(df), dtype=np.uint64)
+    columns = zip(df['Role'], df['Domain'], df['Skills'], df['Demand Level'], df['Salary Range'])
+    for i, (role, domain, skills, demand, salary) in enumerate(columns):
+        text = "|".join([str(role).strip().lower(), str(domain).strip().lower(), *sorted(set(skills)),
+                         str(demand).strip().lower(), str(salary).strip()])
+        digests[i] = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    return digests
+
+
+class SkillMarket:
+    def __init__(self, keys=(), postings=None, demand=None, salary=None, digests=None):
+        self.keys = [tuple(k) for k in keys]                   # row -> (skill, domain lower-cased or "")
+        self.key_rows = {k: i for i, k in enumerate(self.keys)}
+        n = len(self.keys)
+        self.postings = np.zeros(n, np.int64) if postings is None else np.asarray(postings)
+        self.demand = np.zeros((n, len(DEMAND_LEVELS)), np.int64) if demand is None else np.asarray(demand)
+        self.salary = np.zeros((n, SALARY_BINS), np.int32) if salary is None else np.asarray(salary)
+        self.digests = np.empty(0, np.uint64) if digests is None else np.asarray(digests)
+        self.sources = []
+        self.build_id = None            # set once saved or loaded
+        self._summarize()
+
+    # ---------------------- UPDATE ----------------------
+    def add_postings(self, df, source=None):
+        """Fold in the postings of df not seen before; returns how many were new."""
+        digests = posting_digests(df)
+        _, first = np.unique(digests, return_index=True)
+        fresh = np.sort(first[~np.isin(digests[first], self.digests)])
+        if len(fresh) == 0:
+            return 0
+
+        salaries = {}                   # parsed once per distinct range string
+        levels = {level: i for i, level in enumerate(DEMAND_LEVELS)}
+        rows, demand_ids, salary_bins = [], [], []
+        new_keys = []
+        new_rows = df.iloc[fresh]
+        columns = zip(new_rows['Skills'], new_rows['Domain'], new_rows['Demand Level'], new_rows['Salary Range'])
+        for skills, domain, demand, text in columns:
+            domain = str(domain).strip().lower()
+            demand = levels.get(str(demand).strip().lower(), -1)
+            text = str(text)
+            if text not in salaries:
+                salaries[text] = parse_salary(text)
+            midpoint = salaries[text]
+            salary_bin = -1 if midpoint is None else min(int(midpoint // SALARY_BIN), SALARY_BINS - 1)
+            for skill in set(skills):
+                for key in ((skill, ALL_DOMAINS), (skill, domain)):
+                    if key not in self.key_rows:
+                        self.key_rows[key] = len(self.keys) + len(new_keys)
+                        new_keys.append(key)
+                    rows.append(self.key_rows[key])
+                    demand_ids.append(demand)
+                    salary_bins.append(salary_bin)
+
+        if new_keys:
+            self.keys += new_keys
+            grow = len(new_keys)
+            self.postings = np.concatenate([self.postings, np.zeros(grow, np.int64)])
+            self.demand = np.concatenate([self.demand, np.zeros((grow, len(DEMAND_LEVELS)), np.int64)])
+            self.salary = np.concatenate([self.salary, np.zeros((grow, SALARY_BINS), np.int32)])
+        else:                           # memory-mapped read-only on load
+            self.postings, self.demand, self.salary = (np.array(a) for a in (self.postings, self.demand, self.salary))
+
+        rows, demand_ids, salary_bins = (np.array(a, dtype=np.int64) for a in (rows, demand_ids, salary_bins))
+        np.add.at(self.postings, rows, 1)
+        known = demand_ids >= 0
+        np.add.at(self.demand, (rows[known], demand_ids[known]), 1)
+        paid = salary_bins >= 0
+        np.add.at(self.salary, (rows[paid], salary_bins[paid]), 1)
+
+        self.digests = np.union1d(self.digests, digests[fresh])
+        if source is not None:
+            self.sources.append({"source": os.path.basename(source), "postings": int(len(fresh))})
+        self._summarize()
+        return len(fresh)
+
+    def _summarize(self):
+        # Lookup table derived from the counts: demand shares and salary percentiles.
+        totals = self.demand.sum(axis=1, keepdims=True)
+        self.demand_share = np.divide(self.demand, totals, out=np.zeros(self.demand.shape), where=totals > 0)
+        cumulative = np.cumsum(self.salary, axis=1)
+        paid = cumulative[:, -1:] if len(self.keys) else np.zeros((0, 1))
+        self.salary_percentiles = np.full((len(self.keys), len(PERCENTILES)), np.nan)
+        for j, p in enumerate(PERCENTILES):
+            # Lower edge of the first bin whose cumulative count reaches p% of the paid postings.
+            bins = (cumulative < np.ceil(paid * p / 100)).sum(axis=1)
+            self.salary_percentiles[:, j] = np.where(paid[:, 0] > 0, bins * SALARY_BIN, np.nan)
+
+    # ---------------------- LOOKUP ----------------------
+    def stats(self, skill, domain=None):
+        """
+        Postings, demand shares and salary percentiles for a normalized skill,
+        within domain when it has at least MIN_DOMAIN_POSTINGS postings there.
+        None for skills no posting asks for.
+        """
+        row = None
+        if domain:
+            row = self.key_rows.get((skill, domain.strip().lower()))
+            if row is not None and self.postings[row] < MIN_DOMAIN_POSTINGS:
+                row = None
+        if row is None:
+            row = self.key_rows.get((skill, ALL_DOMAINS))
+            if row is None:
+                return None
+        salary = self.salary_percentiles[row]
+        return {
+            "postings": int(self.postings[row]),
+            "domain": self.keys[row][1] or None,
+            "demand": {level: float(share) for level, share in zip(DEMAND_LEVELS, self.demand_share[row])},
+            "salary": None if np.isnan(salary[0]) else {f"p{p}": float(v) for p, v in zip(PERCENTILES, salary)},
+        }
+
+    def rank(self, skills, domain=None):
+        """
+        [(skill, stats)] for the given (gap) skills, most valuable first:
+        higher median salary, then larger share of high-demand postings,
+        then more postings. Skills with no postings come last, alphabetically.
+        """
+        ranked = [(skill, self.stats(skill, domain)) for skill in set(normalize_skills_list(skills))]
+
+        def value(item):
+            skill, stats = item
+            if stats is None:
+                return (1, 0.0, 0.0, 0, skill)
+            median = stats["salary"]["p50"] if stats["salary"] else 0.0
+            return (0, -median, -stats["demand"]["high"], -stats["postings"], skill)
+        return sorted(ranked, key=value)
+
+
+# ---------------------- PERSISTENCE ----------------------
+# Like the model artifacts: every save is a new build directory under
+# Model/market/<dataset>/ and CURRENT is flipped to it last, so readers never
+# see a missing or half-written table.
+def market_path(csv_path=POSTINGS_PATH, market_dir=MARKET_DIR):
+    return os.path.join(market_dir, os.path.splitext(os.path.basename(csv_path))[0])
+
+def current_market_dir(path):
+    build_id = read_current(path)
+    return os.path.join(path, build_id) if build_id else None
+
+def save_market(market, base_sha256, path):
+    os.makedirs(path, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".market-", dir=path)
+    try:
+        for name in ("postings", "demand", "salary", "digests"):
+            np.save(os.path.join(staging, f"{name}.npy"), getattr(market, name))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    def write_meta(build_id):
+        meta = {"market_version": MARKET_VERSION, "build_id": build_id, "base_sha256": base_sha256,
+                "keys": market.keys, "sources": market.sources}
+        with open(os.path.join(staging, MARKET_META), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    build_dir = publish_build(path, staging, time.strftime("%Y%m%d-%H%M%S"), write_meta, MARKET_META)
+    market.build_id = os.path.basename(build_dir)
+    return build_dir
+
+def load_market(path, mmap_mode="r"):
+    """The current table, or None if missing or from another MARKET_VERSION; also returns its meta."""
+    build_dir = current_market_dir(path)
+    try:
+        with open(os.path.join(build_dir, MARKET_META), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (TypeError, OSError, ValueError):
+        return None, None
+    if meta.get("market_version") != MARKET_VERSION:
+        return None, None
+    load = lambda name: np.load(os.path.join(build_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+    market = SkillMarket(meta["keys"], load("postings"), load("demand"), load("salary"), load("digests"))
+    market.sources = meta["sources"]
+    market.build_id = meta["build_id"]
+    return market, meta
+
+def build_market(csv_path=POSTINGS_PATH, market_dir=MARKET_DIR, market=None):
+    """
+    Fold the postings dataset into market (a new table by default) and save it.
+    Rows already counted are skipped, so a grown dataset only adds its new rows.
+    """
+    market = SkillMarket() if market is None else market
+    market.add_postings(load_training_data(csv_path), csv_path)
+    save_market(market, file_sha256(csv_path), market_path(csv_path, market_dir))
+    return market
+
+def open_market(csv_path=POSTINGS_PATH, market_dir=MARKET_DIR):
+    """
+    The market table for the postings dataset: built when missing, and
+    updated in place when the dataset changed, keeping --ingest-ed postings.
+    None if there is no postings dataset at all.
+    """
+    market, meta = load_market(market_path(csv_path, market_dir))
+    if not os.path.exists(csv_path):
+        return market
+    if market is None or meta["base_sha256"] != file_sha256(csv_path):
+        # Postings edited out of the dataset stay counted; delete
+        # Model/market/ to rebuild from scratch.
+        market = build_market(csv_path, market_dir, market)
+    return market
+
+def ingest(paths, csv_path=POSTINGS_PATH, market_dir=MARKET_DIR):
+    path = market_path(csv_path, market_dir)
+    market, meta = load_market(path, mmap_mode=None)
+    if market is None:
+        market, meta = build_market(csv_path, market_dir), {"base_sha256": file_sha256(csv_path)}
+    added = 0
+    for new_path in paths:
+        n = market.add_postings(load_training_data(new_path), new_path)
+        print(f"{new_path}: {n} new postings")
+        added += n
+    if added:
+        save_market(market, meta["base_sha256"], path)
+    return market, added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or update the skill demand/salary tables.")
+    parser.add_argument("--ingest", nargs="+", metavar="CSV",
+                        help="postings with Job Title/Domain/Required Skills/Demand Level/Salary Range columns")
+    parser.add_argument("--dataset", default=POSTINGS_PATH)
+    parser.add_argument("--out", default=MARKET_DIR)
+    parser.add_argument("--top", type=int, default=10, help="print the most valuable skills")
+    args = parser.parse_args()
+
+    if args.ingest:
+        market, _ = ingest(args.ingest, args.dataset, args.out)
+    else:
+        market = build_market(args.dataset, args.out)
+    skills = sorted({skill for skill, domain in market.keys if domain == ALL_DOMAINS})
+    print(f"{len(market.digests)} postings, {len(skills)} skills, {len(market.keys) - len(skills)} (skill, domain) keys")
+    for skill, stats in market.rank(skills)[:args.top]:
+        salary = stats["salary"]
+        print(f"  {skill:<32} {stats['postings']:>6} postings  median ${salary['p50']:,.0f}  "
+              f"high demand {stats['demand']['high']:.0%}")
@@ -0,0 +1,279 @@
+# ---------------------- SKILL NORMALIZATION ----------------------
+import math
+import os
+import re
+
+import numpy as np
+
+# Similarity (1 - edit distance / length) a resume phrase needs to count as a
+# misspelt or variant skill; 1 turns fuzzy matching off.
+FUZZY_THRESHOLD = float(os.environ.get("SKILLFIT_FUZZY_THRESHOLD", "0.9"))
+# Bumped when matching rules change, so cached analyses are redone.
+MATCHER_VERSION = 3
+
+# Keys are lower-case: they are looked up after lower-casing.
+skill_mapping = {
+    "ml": "machine learning", "dl": "deep learning", "ai": "artificial intelligence",
+    "rest api": "rest api", "rest apis": "rest api", "restful api": "rest api",
+    "restful": "rest api", "rest": "rest api", "springboot": "spring boot",
+    "spring-boot": "spring boot", "apis": "api", "large language models": "llms",
+    "large language model": "llms", "llm": "llms", "natural language understanding": "natural language processing",
+    "natural language generation": "natural language processing", "nlp": "natural language processing",
+    "natural language processing": "natural language processing", "viz": "visualization",
+    "data viz": "data visualization", "tensorflow 2.0": "tensorflow", "py": "python",
+    "react": "react", "react js": "react", "react.js": "react", "js": "javascript",
+    "c plus plus": "c++", "cpp": "c++", "csharp": "c#", "rdbms": "relational database",
+    "sql server": "sql", "postgressql": "postgresql", "nosql db": "nosql",
+    "xgboost": "gradient boosting", "gboost": "gradient boosting", "pytorch": "deep learning",
+    "prompting": "prompt engineering", "prompt": "prompt engineering", "ai prompt": "prompt engineering",
+    "ai prompting": "prompt engineering", "convolutional neural network": "cnn",
+    "convolutional neural networks": "cnn", "convolutional neural net": "cnn",
+    "convolutional neural nets": "cnn", "recurrent neural network": "rnn",
+    "recurrent neural networks": "rnn", "recurrent neural net": "rnn",
+    "recurrent neural nets": "rnn", "long short term memory": "lstm",
+    "long short term memory networks": "lstm", "long short term memory net": "lstm",
+    "genarative adversarial networks": "gans", "generative adversarial network": "gans",
+    "ml pipeline": "ml pipelines", "mlpipeline": "ml pipelines", "mlops": "ml ops",
+    "stats": "statistics", "stat": "statistics", "maths": "mathematics", "math": "mathematics",
+    "algorithm": "algorithms", "data structures": "data structures", "data structure": "data structures",
+    "dsa": "dsa", "system designing": "system design", "system design": "system design",
+    "oops": "oop", "object oriented programming": "oop", "object oriented programming language": "oop",
+    "postgres": "postgresql", "sklearn": "scikit-learn", "scikit learn": "scikit-learn", "k8s": "kubernetes",
+}
+
+def canonical_skill(skill):
+    # Lower-cased, underscores as spaces, whitespace collapsed, then aliased.
+    skill = ' '.join(skill.lower().replace('_', ' ').split())
+    return skill_mapping.get(skill, skill)
+
+def normalize_skills_list(skill_list):
+    return [canonical_skill(skill) for skill in skill_list]
+
+
+# ---------------------- VOCABULARY ENGINE ----------------------
+# Shared by the extractor (which surface forms to look for in a resume) and
+# the predictor (canonical_skill above): one alias table, one normalization.
+
+# Aliases that are ordinary words in running text ("rest of the team"); they
+# still normalize skill lists but are not searched for in resumes.
+AMBIGUOUS_ALIASES = {"rest", "prompt", "prompting", "py", "stat", "math"}
+
+def surface_forms(vocabulary):
+    """
+    (vocabulary skill, lower-cased text form) pairs to look for in text: each
+    skill's own form, its hyphen variants ("scikit learn", "scikitlearn") and
+    every alias that canonicalizes to the same skill ("nlp", "postgres").
+    Aliases that are themselves a vocabulary skill only report that skill.
+    """
+    forms = set()
+    by_form = {}
+    by_canonical = {}
+    for skill in vocabulary:
+        form = ' '.join(skill.lower().split())
+        by_form.setdefault(form, []).append(skill)
+        by_canonical.setdefault(canonical_skill(skill), []).append(skill)
+        forms.add((skill, form))
+        if '-' in form:
+            forms.add((skill, form.replace('-', ' ')))
+            forms.add((skill, form.replace('-', '')))
+    for alias, target in skill_mapping.items():
+        if alias in by_form or alias in AMBIGUOUS_ALIASES:
+            continue
+        # The skill spelled like the alias target, else any that canonicalizes the same.
+        for skill in by_form.get(target) or by_canonical.get(canonical_skill(target), []):
+            forms.add((skill, alias))
+    return sorted(forms)
+
+
+# Words as they appear in skill names: "node.js", "ci/cd", "scikit-learn", "c++".
+_WORD = re.compile(r"[\w+#]+(?:[./-][\w+#]+)*")
+# A version number after a skill: "python3", "html5", "angular 2".
+_VERSION = re.compile(r"(?<=[a-z+#])\s?v?\d+(?:\.\d+)*$")
+
+def _grams(text, q=3):
+    padded = f" {text} "
+    return {padded[i:i + q] for i in range(len(padded) - q + 1)}
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance of a and b, or limit + 1 once it must exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzySkillIndex:
+    """
+    Approximate lookup of a text span against a large set of skill forms.
+
+    A span within edit distance k of a form shares all but at most 3k of its
+    character trigrams with it, and vice versa. With trigrams ranked from
+    rarest to most common, two strings that share all but 3k of each one's
+    trigrams must share s + 1 of each one's 3k + 1 + s rarest (prefix
+    filtering, s = PREFIX_SLACK). So each form is indexed under just those
+    rarest trigrams, keyed by form length, and a lookup counts, for all
+    spans at once, the forms posted under each span's own rarest trigrams
+    at the lengths the threshold allows. The few candidates get a trigram
+    count check and then the exact edit distance. Similarity is
+    1 - distance / longer length. A form followed by a version number
+    ("python3" for forms of two or more characters, "angular 2" for forms
+    of min_length or more) counts as an exact hit.
+    """
+    PREFIX_SLACK = 3    # read 3 more prefix trigrams, keep forms that share 4 of them
+
+    def __init__(self, forms, threshold=FUZZY_THRESHOLD, min_length=5, cache_size=100_000):
+        self.threshold = threshold
+        self.min_length = min_length
+        self.cache_size = cache_size
+        self.forms = []                 # id -> form text
+        self.owners = []                # id -> vocabulary skills
+        self.form_grams = []            # id -> trigram set
+        self.ids = {}                   # form text -> id
+        for skill, form in forms:
+            if form not in self.ids:
+                self.ids[form] = len(self.forms)
+                self.forms.append(form)
+                self.owners.append([])
+                self.form_grams.append(_grams(form))
+            self.owners[self.ids[form]].append(skill)
+        self.max_words = max((len(f.split()) for f in self.forms), default=0)
+
+        # Global rarest-first trigram order; unseen trigrams rank first.
+        frequency = {}
+        for grams in self.form_grams:
+            for gram in grams:
+                frequency[gram] = frequency.get(gram, 0) + 1
+        self.rank = {g: i + 1 for i, g in enumerate(sorted(frequency, key=lambda g: (frequency[g], g)))}
+
+        # trigram -> (form ids ordered by length, start of each length's run)
+        postings = {}
+        for form_id, form in enumerate(self.forms):
+            if len(form) >= min_length:         # shorter forms are exact-only
+                for gram in self._prefix(self.form_grams[form_id], self._max_edits(len(form) / threshold)):
+                    postings.setdefault(gram, []).append(form_id)
+        self.postings = {}
+        for gram, ids in postings.items():
+            lengths = np.array([len(self.forms[i]) for i in ids])
+            order = np.argsort(lengths, kind="stable")
+            starts = np.searchsorted(lengths[order], np.arange(lengths.max() + 2)).tolist()
+            self.postings[gram] = (np.array(ids, dtype=np.int32)[order], starts)
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.forms)
+
+    def lookup(self, span):
+        """(form id, similarity) of the closest form at or above the threshold, or None."""
+        return self.lookup_many([span])[span]
+
+    def lookup_many(self, spans):
+        """{span: lookup(span)}, with the posting lists of all uncached spans merged in one pass."""
+        results = {}
+        computed = []
+        planned = []                    # (span, trigrams, posting lists)
+        for span in spans:
+            cached = self._cache.get(span, False)
+            if cached is not False:
+                results[span] = cached
+            elif span not in results:
+                computed.append(span)
+                results[span], work = self._plan(span)
+                if work is not None:
+                    planned.append((span, *work))
+
+        if planned:
+            # Count each (span, form) pair's shared prefix trigrams at once.
+            sizes = [sum(len(ids) for ids in lists) for _, _, lists in planned]
+            owner = np.repeat(np.arange(len(planned), dtype=np.int64), sizes)
+            ids = np.concatenate([ids for _, _, lists in planned for ids in lists])
+            pairs, counts = np.unique(owner * len(self.forms) + ids, return_counts=True)
+            pairs = pairs[counts > self.PREFIX_SLACK]
+            for row, form_id in zip((pairs // len(self.forms)).tolist(), (pairs % len(self.forms)).tolist()):
+                span, grams, _ = planned[row]
+                hit = self._verify(span, grams, form_id)
+                if hit is not None and (results[span] is None or hit[1] > results[span][1]):
+                    results[span] = hit
+
+        if len(self._cache) + len(computed) >= self.cache_size:
+            self._cache.clear()
+        for span in computed:
+            self._cache[span] = results[span]
+        return results
+
+    def _max_edits(self, longer):
+        return int((1 - self.threshold) * longer + 1e-9)
+
+    def _prefix(self, grams, edits):
+        # Unseen trigrams rank first; they are in no posting list anyway.
+        return sorted(grams, key=lambda g: self.rank.get(g, 0))[:3 * edits + 1 + self.PREFIX_SLACK]
+
+    def _plan(self, span):
+        # (exact version hit, None) or (None, (trigrams, posting lists to count)).
+        version = _VERSION.search(span)
+        if version and span[:version.start()] in self.ids:
+            base = span[:version.start()]
+            # "html5" for forms of two or more characters ("r2" is a score,
+            # not R); "angular 2" only for forms long enough not to be an
+            # acronym before a number ("dns 1").
+            spaced = span[version.start()].isspace()
+            if len(base) >= (self.min_length if spaced else 2):
+                return (self.ids[base], 1.0), None
+        if len(span) < self.min_length:
+            return None, None
+        # Longest edit distance that can still reach the threshold against a
+        # form of any length this span could be compared with.
+        limit = self._max_edits(len(span) / self.threshold)
+        if limit == 0:
+            return None, None
+        grams = _grams(span)
+        if len(grams) <= 3 * limit:
+            return None, None
+        # Forms of length lo..hi can reach the threshold against this span.
+        lo = math.ceil(len(span) * self.threshold - 1e-9)
+        hi = math.floor(len(span) / self.threshold + 1e-9)
+        lists = []
+        for gram in self._prefix(grams, limit):
+            entry = self.postings.get(gram)
+            if entry is not None:
+                ids, starts = entry
+                a, b = starts[min(lo, len(starts) - 1)], starts[min(hi + 1, len(starts) - 1)]
+                if b > a:
+                    lists.append(ids[a:b])
+        return None, ((grams, lists) if lists else None)
+
+    def _verify(self, span, grams, form_id):
+        form = self.forms[form_id]
+        longer = max(len(form), len(span))
+        allowed = self._max_edits(longer)
+        if len(grams & self.form_grams[form_id]) < max(len(grams), len(self.form_grams[form_id])) - 3 * allowed:
+            return None
+        distance = edit_distance(span, form, allowed)
+        return (form_id, 1 - distance / longer) if distance <= allowed else None
+
+    def find(self, text):
+        """
+        [(skills, start, end, similarity)] for spans of up to max_words words
+        in (normalized) text that approximately match a form, best first and
+        without overlaps.
+        """
+        words = [(m.start(), m.end()) for m in _WORD.finditer(text)]
+        spans = [(start, end) for i, (start, _) in enumerate(words) for _, end in words[i:i + self.max_words]]
+        found = self.lookup_many([text[start:end] for start, end in spans])
+        hits = []
+        for start, end in spans:
+            hit = found[text[start:end]]
+            if hit is not None:
+                hits.append((hit[1], end - start, start, end, hit[0]))
+        hits.sort(key=lambda h: (-h[0], -h[1], h[2]))
+        taken = []
+        for score, _, start, end, form_id in hits:
+            if all(end <= s or start >= e for _, s, e, _ in taken):
+                taken.append((self.owners[form_id], start, end, score))
+        return taken
@@ -0,0 +1,275 @@
+# skill_store.py
+# Columnar store for the skill datasets (final.csv, final_synthetic_job_postings.csv).
+#
+#   python skill_store.py                 # convert both datasets into Model/store/
+#   python skill_store.py --report        # load time / memory: CSV path vs store
+#
+# The CSVs keep each row's skills as a stringified Python list, so every load
+# parses them with ast.literal_eval and normalizes every skill of every row.
+# The store parses once and keeps, per dataset, in Model/store/<dataset>/<build_id>/
+# (the dataset directory's CURRENT file names the live build, as for the model):
+#   skill_ids.npy    int32  every row's skills back to back, as ids into the skill vocabulary
+#   offsets.npy      int64  row i's skills are skill_ids[offsets[i]:offsets[i + 1]]
+#   <column>.npy     int32  category codes for every other column (role, domain, ...)
+#   keep.npy         bool   first occurrence of each raw row (what drop_duplicates keeps)
+#   meta.json               vocabularies, column order and the source CSV's SHA-256
+# Arrays are memory-mapped on open; skills are normalized once per distinct
+# skill rather than once per occurrence.
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_artifacts import publish_build, read_current
+from skill_normalization import normalize_skills_list
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "Model", "store")
+DATASETS = [
+    os.path.join(BASE_DIR, "final.csv"),
+    os.path.join(BASE_DIR, "final_synthetic_job_postings.csv"),
+]
+SKILL_COLUMNS = ("Skills", "Required Skills")
+STORE_VERSION = 2
+META_FILE = "meta.json"
+
+_QUOTED = re.compile(r"'([^'\\]*)'")
+_LIST_SHAPE = re.compile(r"\[\s*(?:\x00\s*,\s*)*(?:\x00\s*)?\]")   # \x00 stands for one quoted item
+
+
+# ---------------------- PARSING ----------------------
+def parse_skill_list(text):
+    # Same result as ast.literal_eval for the "['A', 'B']" lists in the CSVs,
+    # without building an AST; anything unusual goes to literal_eval.
+    if not any(c in text for c in ('"', "\\", "\x00")):
+        if _LIST_SHAPE.fullmatch(_QUOTED.sub("\x00", text).strip()):
+            return _QUOTED.findall(text)
+    return ast.literal_eval(text)
+
+def file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def dataset_dir(csv_path, store_dir=STORE_DIR):
+    # Holds the dataset's builds and the CURRENT pointer.
+    return os.path.join(store_dir, os.path.splitext(os.path.basename(csv_path))[0])
+
+def store_path(csv_path, store_dir=STORE_DIR):
+    """The current store build of csv_path, or None."""
+    parent = dataset_dir(csv_path, store_dir)
+    build_id = read_current(parent)
+    return os.path.join(parent, build_id) if build_id else None
+
+
+# ---------------------- CONVERT ----------------------
+def convert(csv_path, store_dir=STORE_DIR, chunksize=50_000):
+    """Stream a dataset CSV into the columnar store; returns the store directory."""
+    vocab = {}            # raw skill string -> id
+    categories = {}       # column -> {value: code}
+    skill_ids, offsets, codes, keep = [], [np.zeros(1, dtype=np.int64)], {}, []
+    seen_rows = set()
+    total = 0
+    columns = skill_column = None
+
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=str, keep_default_na=False):
+        if columns is None:
+            columns = list(chunk.columns)
+            skill_column = next(c for c in columns if c in SKILL_COLUMNS)
+            codes = {c: [] for c in columns if c != skill_column}
+            categories = {c: {} for c in codes}
+
+        lengths = np.empty(len(chunk), dtype=np.int64)
+        for i, text in enumerate(chunk[skill_column]):
+            items = parse_skill_list(text)
+            lengths[i] = len(items)
+            skill_ids.append(np.fromiter((vocab.setdefault(s, len(vocab)) for s in items), dtype=np.int32, count=len(items)))
+        offsets.append(total + np.cumsum(lengths))
+        total += int(lengths.sum())
+
+        for column, mapping in categories.items():
+            codes[column].append(np.fromiter(
+                (mapping.setdefault(v, len(mapping)) for v in chunk[column]), dtype=np.int32, count=len(chunk)
+            ))
+        for row in zip(*(chunk[c] for c in columns)):
+            keep.append(row not in seen_rows)
+            seen_rows.add(row)
+
+    parent = dataset_dir(csv_path, store_dir)
+    os.makedirs(parent, exist_ok=True)
+    source_sha256 = file_sha256(csv_path)
+    staging = tempfile.mkdtemp(prefix=".store-", dir=parent)
+    try:
+        np.save(os.path.join(staging, "skill_ids.npy"), np.concatenate(skill_ids) if skill_ids else np.empty(0, np.int32))
+        np.save(os.path.join(staging, "offsets.npy"), np.concatenate(offsets))
+        np.save(os.path.join(staging, "keep.npy"), np.array(keep, dtype=bool))
+        for column, parts in codes.items():
+            np.save(os.path.join(staging, f"{column_file(column)}.npy"), np.concatenate(parts))
+        meta = {
+            "store_version": STORE_VERSION,
+            "source": os.path.basename(csv_path),
+            "source_sha256": source_sha256,
+            "rows": len(keep),
+            "columns": columns,
+            "skill_column": skill_column,
+            "skills": list(vocab),
+            "categories": {column: list(mapping) for column, mapping in categories.items()},
+        }
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Readers that already opened the previous build keep their memory maps;
+    # it is only deleted once pruned.
+    def write_meta(build_id):
+        meta["build_id"] = build_id
+        with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    base_id = time.strftime("%Y%m%d-%H%M%S") + "-" + source_sha256[:12]
+    return publish_build(parent, staging, base_id, write_meta, META_FILE)
+
+def column_file(column):
+    return re.sub(r"\W+", "_", column).strip("_").lower()
+
+
+# ---------------------- LOAD ----------------------
+class SkillStore:
+    def __init__(self, path, mmap_mode="r"):
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        load = lambda name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+        self.skills = np.array(self.meta["skills"], dtype=object)      # id -> raw skill
+        self.skill_ids = load("skill_ids")
+        self.offsets = load("offsets")
+        self.keep = load("keep")
+        self.codes = {c: load(column_file(c)) for c in self.meta["categories"]}
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def column(self, name):
+        # Categorical view over the stored codes; no per-row strings.
+        return pd.Categorical.from_codes(self.codes[name], categories=self.meta["categories"][name])
+
+    def row_skills(self, i):
+        return list(self.skills[self.skill_ids[self.offsets[i]:self.offsets[i + 1]]])
+
+    def normalized_vocabulary(self):
+        # Normalized id per raw id, and the normalized strings themselves.
+        normalized = normalize_skills_list(self.meta["skills"])
+        names = sorted(set(normalized))
+        index = {s: i for i, s in enumerate(names)}
+        return np.array([index[s] for s in normalized], dtype=np.int32), np.array(names, dtype=object)
+
+    def training_frame(self, drop_duplicates=True):
+        """
+        The frame model_artifacts.prepare_training_data builds from the CSV
+        (Role, Domain, normalized Skills lists, Skills_str, Combined_Label),
+        with the other columns kept categorical.
+        """
+        rows = np.flatnonzero(self.keep) if drop_duplicates else np.arange(len(self))
+        to_norm, names = self.normalized_vocabulary()
+        norm_ids = to_norm[self.skill_ids]
+        starts, ends = self.offsets[rows], self.offsets[rows + 1]
+        skills = [list(names[norm_ids[a:b]]) for a, b in zip(starts, ends)]
+
+        renamed = {"Job Title": "Role", self.meta["skill_column"]: "Skills"}
+        data = {}
+        for column in self.meta["columns"]:
+            if column == self.meta["skill_column"]:
+                data["Skills"] = skills
+            else:
+                data[renamed.get(column, column)] = self.column(column)[rows]
+        df = pd.DataFrame(data, index=rows)
+        df['Skills_str'] = [' '.join(s) for s in skills]
+        df['Combined_Label'] = (df['Role'].astype(str).str.strip() + " || " + df['Domain'].astype(str).str.strip())
+        return df
+
+def open_store(path, mmap_mode="r"):
+    return SkillStore(path, mmap_mode)
+
+def open_store_for(csv_path, store_dir=STORE_DIR):
+    """The store built from exactly this CSV, or None (missing, outdated or different data)."""
+    path = store_path(csv_path, store_dir)
+    try:
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (TypeError, OSError, ValueError):
+        return None
+    if meta.get("store_version") != STORE_VERSION or meta.get("source_sha256") != file_sha256(csv_path):
+        return None
+    return SkillStore(path)
+
+
+# ---------------------- REPORT ----------------------
+# Each measurement runs in a fresh interpreter so the numbers are not skewed
+# by whatever an earlier one left in memory. Peak RSS is reported relative
+# to the interpreter after imports.
+MEASURE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+import model_artifacts, skill_store
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - t
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "peak_rss_mb": (after - before) / 1024}}))
+"""
+
+LOADERS = {
+    "csv (read_csv + literal_eval)": "df = model_artifacts.prepare_training_data(pd.read_csv({path!r}))",
+    "store open (mmap)": "store = skill_store.open_store_for({path!r}); n = int(store.offsets[-1])",
+    "store training_frame": "df = skill_store.open_store_for({path!r}).training_frame()",
+}
+
+def measure(load_code, path, repeat=3):
+    samples = []
+    for _ in range(repeat):
+        code = MEASURE.format(root=BASE_DIR, load=load_code.format(path=path))
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return min(s["seconds"] for s in samples), min(s["peak_rss_mb"] for s in samples)
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+def report(paths, store_dir=STORE_DIR):
+    for path in paths:
+        store = store_path(path, store_dir)
+        print(f"\n{os.path.basename(path)}: CSV {os.path.getsize(path) / 1e6:.2f} MB, store {dir_size(store) / 1e6:.2f} MB")
+        print(f"  {'load path':<32}{'seconds':>10}{'peak RSS MB':>14}")
+        for name, code in LOADERS.items():
+            seconds, rss = measure(code, path)
+            print(f"  {name:<32}{seconds:>10.3f}{rss:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the skill datasets into a columnar store.")
+    parser.add_argument("datasets", nargs="*", default=DATASETS, help="CSV files to convert (default: both datasets)")
+    parser.add_argument("--out", default=STORE_DIR)
+    parser.add_argument("--report", action="store_true", help="compare load time and memory against the CSV path")
+    args = parser.parse_args()
+
+    for path in args.datasets:
+        if open_store_for(path, args.out) is None:
+            store_dir = convert(path, args.out)
+            store = open_store(store_dir)
+            print(f"{path} -> {store_dir} ({len(store)} rows, {len(store.skills)} distinct skills)")
+        else:
+            print(f"{store_path(path, args.out)} is up to date")
+    if args.report:
+        report(args.datasets, args.out)
@@ -0,0 +1,47 @@
+import json
+import os
+
+import batch_process
+
+
+def fake_init_worker(skills_path, reports_dir=None):
+    pass
+
+
+def fake_process_file(path, top_n=5, gap_n=3):
+    # Stands in for a PDF that segfaults MuPDF: the whole worker dies.
+    if os.path.basename(path) == "crash.pdf":
+        os._exit(1)
+    return {"file": path, "status": "ok", "skills": [], "predictions": [], "gaps": [], "timings": {}}
+
+
+def test_worker_crash_only_fails_the_culprit(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_process, "init_worker", fake_init_worker)
+    monkeypatch.setattr(batch_process, "process_file", fake_process_file)
+    files = [f"{i}.pdf" for i in range(12)]
+    files.insert(5, "crash.pdf")
+    output = str(tmp_path / "results.jsonl")
+
+    writer = batch_process.ResultWriter(output, append=False)
+    stats = batch_process.run(files, writer, workers=2, skills_path=None, max_in_flight=8)
+    writer.close()
+
+    with open(output, encoding="utf-8") as f:
+        records = {r["file"]: r for r in map(json.loads, f)}
+    assert set(records) == set(files)
+    assert [path for path, r in records.items() if r["status"] != "ok"] == ["crash.pdf"]
+    assert stats["ok"] == 12 and stats["error"] == 1
+
+
+def test_resume_retries_error_rows(tmp_path):
+    rows = [{"file": "a.pdf", "status": "ok"}, {"file": "b.pdf", "status": "error"}]
+    jsonl = tmp_path / "results.jsonl"
+    jsonl.write_text("".join(json.dumps(row) + "\n" for row in rows) + '{"file": "c.pd', encoding="utf-8")
+    assert batch_process.load_done(str(jsonl)) == {"a.pdf"}
+
+    path = str(tmp_path / "results.csv")
+    writer = batch_process.ResultWriter(path, append=False)
+    writer.write({"file": "a.pdf", "status": "ok"})
+    writer.write({"file": "b.pdf", "status": "error", "error": "boom"})
+    writer.close()
+    assert batch_process.load_done(path) == {"a.pdf"}
@@ -0,0 +1,19 @@
+import pytest
+
+import domainn_predictor
+
+SKILLS = [["Python", "SQL", "Machine Learning"], ["Excel", "Tableau"]]
+
+
+@pytest.mark.parametrize("top_n", [0, -1])
+def test_non_positive_top_n_returns_no_predictions(top_n):
+    assert domainn_predictor.predict_top_roles_domains_batch(SKILLS, top_n=top_n) == [[], []]
+    assert domainn_predictor.predict_top_roles_domains(SKILLS[0], top_n=top_n) == []
+
+
+def test_batch_matches_single_predictions():
+    batch = domainn_predictor.predict_top_roles_domains_batch(SKILLS, top_n=3)
+    assert batch == [domainn_predictor.predict_top_roles_domains(skills, top_n=3) for skills in SKILLS]
+    assert all(len(top) == 3 for top in batch)
+    scores = [score for _, _, score in batch[0]]
+    assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,113 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from inference_service import MAX_BODY_BYTES, InferenceClient, InferenceService
+
+
+class RunningService:
+    """An InferenceService on an ephemeral port, its event loop on a background thread."""
+    def __init__(self, **kwargs):
+        self.service = InferenceService(**kwargs)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        server = self.call(self.service.start("127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+
+    def call(self, coro, timeout=120):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def wait_ready(self, timeout=180):
+        self.call(asyncio.wait_for(asyncio.shield(self.service.warm_up_task), timeout), timeout + 5)
+
+    def client(self):
+        return InferenceClient("127.0.0.1", self.port)
+
+    def raw(self, request):
+        # Send raw bytes, return the status code of the response.
+        with socket.create_connection(("127.0.0.1", self.port), timeout=30) as sock:
+            sock.sendall(request)
+            return int(sock.recv(4096).split(b" ", 2)[1])
+
+    def close(self):
+        self.call(self.service.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+@pytest.fixture(scope="module")
+def running():
+    running = RunningService(workers=1)
+    running.wait_ready()
+    yield running
+    running.close()
+
+
+def test_health_and_ready(running):
+    client = running.client()
+    assert client.request("GET", "/healthz") == (200, {"status": "ok"})
+    status, body = client.request("GET", "/readyz")
+    assert status == 200 and body["status"] == "ready" and body["workers"] == 1
+    client.close()
+
+
+def test_analyze_skills(running):
+    client = running.client()
+    status, body = client.analyze_skills(["Python", "SQL", "Machine Learning"], top_n=3, gap_n=2)
+    assert status == 200
+    assert len(body["predictions"]) == 3
+    assert len(body["gaps"]) == 2
+    assert client.analyze_skills("python")[0] == 400
+    client.close()
+
+
+def test_analyze_text(running):
+    client = running.client()
+    status, body = client.analyze_text("Built ETL pipelines in Python and SQL, dashboards in Tableau.")
+    assert status == 200
+    assert {"Python", "SQL", "Tableau"} <= set(body["skills"])
+    client.close()
+
+
+def test_not_ready_and_busy_get_503(running):
+    client = running.client()
+    running.service.ready = False
+    try:
+        assert client.request("GET", "/readyz")[0] == 503
+        assert client.analyze_skills(["Python"])[0] == 503
+    finally:
+        running.service.ready = True
+
+    running.service.max_pending = 0
+    try:
+        assert client.analyze_skills(["Python"])[0] == 503
+    finally:
+        running.service.max_pending = 256
+    assert client.analyze_skills(["Python"])[0] == 200
+    client.close()
+
+
+def test_body_too_large_gets_413(running):
+    request = f"POST /v1/analyze/text HTTP/1.1\r\nContent-Length: {MAX_BODY_BYTES + 1}\r\n\r\n"
+    assert running.raw(request.encode("ascii")) == 413
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_bad_content_length_gets_400(running, length):
+    request = f"POST /v1/analyze/skills HTTP/1.1\r\nContent-Length: {length}\r\n\r\n"
+    assert running.raw(request.encode("ascii")) == 400
+
+
+def test_failed_warm_up_stops_server(tmp_path):
+    running = RunningService(workers=1, skills_path=str(tmp_path / "missing.json"))
+    try:
+        with pytest.raises(Exception):
+            running.wait_ready()
+        running.call(asyncio.sleep(0))      # let the done-callback run
+        assert running.service.warm_up_error is not None
+        assert not running.service.server.is_serving()
+    finally:
+        running.close()
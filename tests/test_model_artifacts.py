@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+import model_artifacts
+from model_artifacts import CURRENT_FILE, current_build_dir, load_artifacts, read_manifest, save_artifacts
+
+FILES = {"label_encoder": "label_encoder.joblib"}
+
+
+def artifacts():
+    return {"backend": "centroid", "label_encoder": LabelEncoder().fit(["a", "b"])}
+
+
+def builds(artifact_dir):
+    return sorted(name for name in os.listdir(os.path.join(artifact_dir, "centroid"))
+                  if not name.startswith(".") and name != CURRENT_FILE)
+
+
+def test_same_second_publishes_get_distinct_builds(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_artifacts.time, "strftime", lambda fmt: "20260101-000000")
+    first = save_artifacts(artifacts(), "ab" * 32, str(tmp_path), FILES)
+    second = save_artifacts(artifacts(), "ab" * 32, str(tmp_path), FILES)
+    assert first != second and os.path.isdir(first)
+    assert current_build_dir(str(tmp_path), "centroid") == second
+    assert read_manifest(second)["build_id"] == os.path.basename(second)
+
+
+def test_old_builds_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_artifacts, "KEEP_BUILDS", 2)
+    published = [save_artifacts(artifacts(), f"{i:064x}", str(tmp_path), FILES) for i in range(4)]
+    kept = builds(str(tmp_path))
+    assert len(kept) == 2
+    assert os.path.basename(published[-1]) in kept
+
+
+def test_which_arrays_are_memory_mapped(tmp_path):
+    # Plain arrays stay on the map; sklearn copies forest nodes into the process.
+    rows = [("Analyst", "Data", ["sql", "excel"]), ("Engineer", "Data", ["python", "spark"])] * 5
+    df = pd.DataFrame(rows, columns=["Role", "Domain", "Skills"])
+    df["Skills_str"] = df["Skills"].str.join(" ")
+    df["Combined_Label"] = df["Role"] + " || " + df["Domain"]
+    save_artifacts(model_artifacts.train(df, backend="forest"), "ab" * 32, str(tmp_path))
+
+    loaded = load_artifacts(str(tmp_path), str(tmp_path / "missing.csv"), backend="forest")
+    assert isinstance(loaded["vectorizer"].idf_, np.memmap)
+    assert isinstance(loaded["gap_index"].required, np.memmap)
+    tree = loaded["model"].estimators_[0].tree_
+    assert not any(isinstance(a, np.memmap) for a in (tree.value, tree.feature, tree.threshold))
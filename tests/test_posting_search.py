@@ -0,0 +1,51 @@
+import functools
+
+import numpy as np
+
+import model_artifacts
+import posting_search
+import skill_store
+
+POSTINGS = """Job Title,Domain,Required Skills,Qualification,Demand Level,Salary Range
+Data Analyst,Data Science & Analytics,"['SQL', 'Tableau', 'Excel']",Bachelor's,Medium,"$120,000 - $150,000"
+Intern,Data Science & Analytics,[],Bachelor's,Low,"$30,000 - $40,000"
+Data Engineer,Data Science & Analytics,"['Python', 'SQL', 'Spark']",Master's,High,"$130,000 - $160,000"
+Trainee,Cybersecurity,[],PhD,Low,"$50,000 - $70,000"
+"""
+
+
+def test_postings_without_skills(tmp_path, monkeypatch):
+    csv_path = tmp_path / "postings.csv"
+    csv_path.write_text(POSTINGS, encoding="utf-8")
+    store_dir = str(tmp_path / "store")
+    monkeypatch.setattr(posting_search, "convert", functools.partial(skill_store.convert, store_dir=store_dir))
+    monkeypatch.setattr(posting_search, "open_store_for", functools.partial(skill_store.open_store_for, store_dir=store_dir))
+
+    index = posting_search.open_index(str(csv_path), str(tmp_path / "search"))
+    assert len(index) == 4
+    data, indptr = np.asarray(index.data), np.asarray(index.indptr)
+    norms = [np.linalg.norm(data[a:b]) for a, b in zip(indptr[:-1], indptr[1:])]
+    assert np.allclose(norms, [1, 0, 1, 0])
+
+    results = index.search(["python", "sql"], k=10)
+    assert [r["title"] for r in results] == ["Data Engineer", "Data Analyst"]
+    assert results[0]["missing"] == ["spark"]
+
+
+def test_rebuild_publishes_a_new_build_and_keeps_the_open_one(tmp_path, monkeypatch):
+    csv_path = tmp_path / "postings.csv"
+    csv_path.write_text(POSTINGS, encoding="utf-8")
+    store_dir, search_dir = str(tmp_path / "store"), str(tmp_path / "search")
+    monkeypatch.setattr(posting_search, "convert", functools.partial(skill_store.convert, store_dir=store_dir))
+    monkeypatch.setattr(posting_search, "open_store_for", functools.partial(skill_store.open_store_for, store_dir=store_dir))
+
+    old = posting_search.open_index(str(csv_path), search_dir)
+    csv_path.write_text(POSTINGS.replace("'Spark'", "'Spark', 'Airflow'"), encoding="utf-8")
+    new = posting_search.open_index(str(csv_path), search_dir)
+    assert new.meta["build_id"] != old.meta["build_id"]
+    assert "airflow" in new.skill_ids and "airflow" not in old.skill_ids
+
+    # The index opened before the rebuild still reads its own files.
+    assert [r["title"] for r in old.search(["spark"])] == ["Data Engineer"]
+    parent = posting_search.index_dir(str(csv_path), search_dir)
+    assert model_artifacts.read_current(parent) == new.meta["build_id"]
@@ -0,0 +1,41 @@
+import sqlite3
+
+from result_cache import ResultCache
+
+
+def test_disk_tier_round_trip_and_expiry(tmp_path):
+    db_path = str(tmp_path / "results.db")
+    cache = ResultCache(max_entries=1, ttl=3600, db_path=db_path)
+    cache.put("a", {"skills": ["python"]})
+    cache.put("b", {"skills": []})              # evicts "a" from memory
+    assert cache.get("a") == {"skills": ["python"]}
+    assert cache.stats()["disk_hits"] == 1
+
+    stale = ResultCache(ttl=-1, db_path=db_path)
+    assert stale.get("b") is None
+    assert stale.stats()["expired"] == 1
+    assert ResultCache(db_path=db_path).get("b") is None
+
+
+def test_connections_are_closed(tmp_path, monkeypatch):
+    opened = []
+
+    class Tracked(sqlite3.Connection):
+        closed = False
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    connect = sqlite3.connect
+
+    def tracked_connect(*args, **kwargs):
+        opened.append(connect(*args, factory=Tracked, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", tracked_connect)
+    cache = ResultCache(db_path=str(tmp_path / "results.db"))
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert opened and all(conn.closed for conn in opened)
@@ -0,0 +1,43 @@
+import os
+
+import skill_market
+from model_artifacts import CURRENT_FILE
+
+HEADER = "Job Title,Domain,Required Skills,Qualification,Demand Level,Salary Range\n"
+BASE = [
+    """Data Analyst,Data Science & Analytics,"['SQL', 'Tableau']",Bachelor's,Medium,"$90,000 - $110,000"\n""",
+    """Data Engineer,Data Science & Analytics,"['Python', 'SQL']",Master's,High,"$130,000 - $150,000"\n""",
+]
+NEW = """ML Engineer,AI,"['Python', 'Docker']",Master's,High,"$150,000 - $170,000"\n"""
+APPENDED = """Analyst,Finance,"['SQL', 'Excel']",Bachelor's,Low,"$60,000 - $80,000"\n"""
+
+
+def write(path, rows):
+    path.write_text(HEADER + "".join(rows), encoding="utf-8")
+    return str(path)
+
+
+def test_grown_dataset_updates_table_and_keeps_ingested_postings(tmp_path):
+    base = write(tmp_path / "postings.csv", BASE)
+    market_dir = str(tmp_path / "market")
+    market = skill_market.open_market(base, market_dir)
+    assert market.stats("sql")["postings"] == 2
+
+    skill_market.ingest([write(tmp_path / "new.csv", [NEW])], base, market_dir)
+    write(tmp_path / "postings.csv", BASE + [APPENDED])
+    market = skill_market.open_market(base, market_dir)
+    assert len(market.digests) == 4
+    assert market.stats("sql")["postings"] == 3
+    assert market.stats("docker")["postings"] == 1
+
+    # Each save is its own build behind CURRENT.
+    path = skill_market.market_path(base, market_dir)
+    assert skill_market.current_market_dir(path) == os.path.join(path, market.build_id)
+    assert len([name for name in os.listdir(path) if not name.startswith(".") and name != CURRENT_FILE]) == 3
+
+
+def test_unchanged_dataset_is_loaded_not_rebuilt(tmp_path):
+    base = write(tmp_path / "postings.csv", BASE)
+    market_dir = str(tmp_path / "market")
+    first = skill_market.open_market(base, market_dir)
+    assert skill_market.open_market(base, market_dir).build_id == first.build_id
@@ -0,0 +1,71 @@
+import json
+import os
+import re
+
+import pytest
+
+from extractor.Skill_extractor import normalize_skill, normalize_text
+from extractor.skill_matcher import SkillMatcher
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills.json")
+
+TEXTS = [
+    "Built dashboards in Power BI and Tableau; wrote SQL (MySQL, PostgreSQL) and Python.",
+    "C++, C#, .NET and Node.js developer. Some Java, no JavaScript... or maybe javascript!",
+    "machine learning, deep   learning | natural language processing, learning machine",
+    "R, r2, Go/Rust, git-flow, CI/CD pipelines with Docker & Kubernetes, AWS-certified",
+    "excel_macro excel macros ExcelVBA sql_server sql server",
+    "",
+]
+
+
+def regex_loop(skills, text):
+    # The original per-skill loop from extract_skills_with_exact_match.
+    found = set()
+    for skill in skills:
+        normalized_skill = normalize_skill(skill)
+        if len(normalized_skill.split()) == 1:
+            if re.search(r'\b' + re.escape(normalized_skill) + r'\b', text):
+                found.add(skill)
+        elif normalized_skill in text:
+            found.add(skill)
+    return found
+
+
+@pytest.fixture(scope="module")
+def skills():
+    with open(SKILLS_PATH, encoding="utf-8") as f:
+        return set(json.load(f)["skills"]) | {"C++", "C#", ".NET", "Node.js", "Go", "R", "Excel VBA", "Sql_Server"}
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_the_regex_loop(skills, text):
+    text = normalize_text(text)
+    matcher = SkillMatcher({skill: normalize_skill(skill) for skill in skills})
+    assert matcher.match(text) == regex_loop(skills, text)
+
+
+@pytest.mark.parametrize("name", ["Profile.pdf", "Profile_2.pdf"])
+def test_matches_the_regex_loop_on_sample_resumes(skills, name):
+    from extractor.Skill_extractor import extract_text_from_pdf
+    text = normalize_text(extract_text_from_pdf(os.path.join(os.path.dirname(SKILLS_PATH), name)))
+    matcher = SkillMatcher({skill: normalize_skill(skill) for skill in skills})
+    assert matcher.match(text) == regex_loop(skills, text)
+
+
+@pytest.mark.parametrize("size", [1, 7, 64])
+def test_scanner_matches_one_shot(skills, size):
+    text = normalize_text(" ".join(TEXTS))
+    matcher = SkillMatcher({skill: normalize_skill(skill) for skill in skills})
+    scanner = matcher.scanner()
+    for i in range(0, len(text), size):
+        scanner.feed(text[i:i + size])
+    assert scanner.finish() == matcher.find(text)
+
+
+def test_word_boundaries():
+    matcher = SkillMatcher({"SQL": "sql", "C++": "c++", "Machine Learning": "machine learning"})
+    assert matcher.match("mysql and sql.") == {"SQL"}
+    assert matcher.match("c++ developer") == set()          # \bc\+\+\b needs a word character after
+    assert matcher.match("c++x") == {"C++"}
+    assert matcher.match("deepmachine learningx") == {"Machine Learning"}   # multi-word: substring
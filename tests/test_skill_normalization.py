@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+from skill_normalization import FuzzySkillIndex, surface_forms
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills.json")
+
+
+@pytest.fixture(scope="module")
+def index():
+    with open(SKILLS_PATH, encoding="utf-8") as f:
+        return FuzzySkillIndex(surface_forms(json.load(f)["skills"]))
+
+
+def found(index, text):
+    return {skill for skills, *_ in index.find(text) for skill in skills}
+
+
+@pytest.mark.parametrize("text", ["see appendix r 2", "ranked r 1", "dns 1", "git 2"])
+def test_short_skill_before_a_spaced_number_is_not_a_version(index, text):
+    assert index.find(text) == []
+
+
+@pytest.mark.parametrize("text", ["achieved an r2 score of 0.91", "r2=0.8"])
+def test_single_letter_skill_with_a_glued_number_is_not_a_version(index, text):
+    assert "R" not in found(index, text)
+
+
+@pytest.mark.parametrize("text", ["Achieved an R2 score of 0.91", "R2=0.8"])
+def test_r2_is_not_extracted_as_r(text):
+    from extractor.Skill_extractor import find_skills_in_text
+    assert "R" not in find_skills_in_text(text, SKILLS_PATH)
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("tensorflow2", "TensorFlow"),
+    ("html5", "HTML"),
+    ("python3", "Python"),
+    ("tensorflow 2", "TensorFlow"),
+])
+def test_version_suffix_is_an_exact_hit(index, text, skill):
+    assert index.find(text) == [([skill], 0, len(text), 1.0)]
+
+
+def test_near_miss(index):
+    assert "Kubernetes" in found(index, "deployed on kubernets clusters")
@@ -0,0 +1,33 @@
+import os
+
+import skill_store
+from model_artifacts import CURRENT_FILE
+
+HEADER = "Job Title,Domain,Required Skills\n"
+ROWS = [
+    """Data Analyst,Data Science & Analytics,"['SQL', 'Tableau']"\n""",
+    """Data Engineer,Data Science & Analytics,"['Python', 'SQL']"\n""",
+]
+
+
+def test_reconvert_publishes_a_new_build_and_keeps_the_open_one(tmp_path):
+    csv_path = tmp_path / "postings.csv"
+    csv_path.write_text(HEADER + ROWS[0], encoding="utf-8")
+    store_dir = str(tmp_path / "store")
+    assert skill_store.open_store_for(str(csv_path), store_dir) is None
+
+    first = skill_store.convert(str(csv_path), store_dir)
+    old = skill_store.open_store_for(str(csv_path), store_dir)
+    assert len(old) == 1
+
+    csv_path.write_text(HEADER + "".join(ROWS), encoding="utf-8")
+    assert skill_store.open_store_for(str(csv_path), store_dir) is None
+    second = skill_store.convert(str(csv_path), store_dir)
+    assert second != first and skill_store.store_path(str(csv_path), store_dir) == second
+    assert len(skill_store.open_store_for(str(csv_path), store_dir)) == 2
+
+    # The store opened before the rebuild still reads its own files.
+    assert os.path.isdir(first) and old.row_skills(0) == ["SQL", "Tableau"]
+    parent = skill_store.dataset_dir(str(csv_path), store_dir)
+    assert sorted(name for name in os.listdir(parent) if not name.startswith(".")) == sorted(
+        [CURRENT_FILE, os.path.basename(first), os.path.basename(second)])
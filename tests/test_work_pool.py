@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from work_pool import Busy, WorkPool
+
+
+@pytest.fixture
+def gate():
+    # Tasks block on this until the test releases them.
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def blocked(gate, value=None):
+    gate.wait(10)
+    return value
+
+
+def test_runs_tasks_and_returns_results():
+    pool = WorkPool(workers=2, queue_depth=2, queue_timeout=5)
+    try:
+        assert pool.run("report", sum, [1, 2, 3]) == 6
+        assert pool.submit("preview", str.upper, "ok").result(5) == "OK"
+        assert pool.stats()["running"] == pool.stats()["queued"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_full_queue_raises_busy(gate):
+    pool = WorkPool(workers=1, queue_depth=1, queue_timeout=5)
+    try:
+        running = pool.submit("analysis", blocked, gate, "first")
+        queued = pool.submit("analysis", blocked, gate, "second")
+        with pytest.raises(Busy) as e:
+            pool.submit("analysis", blocked, gate)
+        assert e.value.stage == "analysis" and e.value.reason == "queue full"
+        assert e.value.retry_after >= 1
+        assert pool.stats()["rejected"] == 1
+
+        gate.set()
+        assert (running.result(5), queued.result(5)) == ("first", "second")
+        assert pool.run("analysis", len, "free again") == 10
+    finally:
+        pool.shutdown()
+
+
+def test_queue_timeout_raises_busy_and_frees_the_slot(gate):
+    pool = WorkPool(workers=1, queue_depth=1, queue_timeout=0.2)
+    try:
+        running = pool.submit("analysis", blocked, gate, "first")
+        with pytest.raises(Busy) as e:
+            pool.run("report", len, "never runs")
+        assert e.value.stage == "report" and "no worker free" in e.value.reason
+        stats = pool.stats()
+        assert stats["timed_out"] == 1 and stats["queued"] == 0
+
+        gate.set()
+        assert running.result(5) == "first"
+    finally:
+        pool.shutdown()
+
+
+def test_task_that_waited_too_long_is_skipped(gate):
+    # submit() without run(): the worker drops the task once it finally starts.
+    pool = WorkPool(workers=1, queue_depth=1, queue_timeout=0.1)
+    try:
+        pool.submit("analysis", blocked, gate)
+        late = pool.submit("preview", len, "stale")
+        threading.Timer(0.3, gate.set).start()
+        with pytest.raises(Busy) as e:
+            late.result(5)
+        assert e.value.stage == "preview" and "waited" in e.value.reason
+        assert pool.stats()["timed_out"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_task_errors_propagate():
+    pool = WorkPool(workers=1, queue_depth=0, queue_timeout=5)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            pool.run("analysis", lambda: 1 / 0)
+        assert pool.stats()["running"] == 0
+    finally:
+        pool.shutdown()
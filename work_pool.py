@@ -0,0 +1,130 @@
+# work_pool.py
+# Process-wide admission control for the app's heavy stages (PDF parsing and
+# skill extraction, preview rendering, inference, report rendering).
+#
+# Every Streamlit session runs its script on its own thread, so a burst of
+# uploads used to run all of that work at once and every session slowed down
+# together. Sessions now hand CPU-bound stages to one shared pool:
+#   - at most SKILLFIT_WORKERS tasks run at a time (default 2)
+#   - at most SKILLFIT_QUEUE_DEPTH more wait for a worker (default: 2x workers)
+#   - a task that has not started after SKILLFIT_QUEUE_TIMEOUT seconds is
+#     dropped (default 30)
+# A full queue or an expired wait raises Busy straight away, so the page can
+# show a "busy, retry" state instead of hanging.
+#
+# These are threads of the Streamlit process, so they share one GIL. Skill
+# extraction (the Aho-Corasick scan, fuzzy edit distances) is pure Python and
+# holds it; only PDF parsing and the model's numpy work release it. More
+# workers than that overlap can use adds contention, not throughput, hence the
+# small default. Scale out with more app processes (or the HTTP service, which
+# extracts in a process pool) rather than more workers.
+#
+# With SKILLFIT_METRICS=1 the pool records queue depth and wait time per task
+# (work_pool_queue_depth, work_pool_wait_seconds) and counts rejections and
+# timeouts per stage (work_pool_<stage>_rejected_total / _timeouts_total).
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import metrics
+
+DEFAULT_WORKERS = int(os.environ.get("SKILLFIT_WORKERS", "2"))
+DEFAULT_QUEUE_DEPTH = int(os.environ.get("SKILLFIT_QUEUE_DEPTH", str(2 * DEFAULT_WORKERS)))
+DEFAULT_QUEUE_TIMEOUT = float(os.environ.get("SKILLFIT_QUEUE_TIMEOUT", "30"))
+
+
+class Busy(Exception):
+    """The pool could not take (or start) the task; try again after retry_after seconds."""
+    def __init__(self, stage, reason, retry_after):
+        super().__init__(f"{stage}: {reason}")
+        self.stage = stage
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class WorkPool:
+    def __init__(self, workers=DEFAULT_WORKERS, queue_depth=DEFAULT_QUEUE_DEPTH, queue_timeout=DEFAULT_QUEUE_TIMEOUT):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.queue_timeout = queue_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skillfit-work")
+        self._lock = threading.Lock()
+        self.queued = 0                 # admitted, waiting for a worker
+        self.running = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._wait_ema = 0.0            # smoothed queue wait, for retry hints
+
+    # ---------------------- SUBMIT ----------------------
+    def submit(self, stage, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) and return its Future, or raise Busy when the
+        queue is full. If no worker picks the task up within queue_timeout it
+        is skipped and the future raises Busy.
+        """
+        with self._lock:
+            if self.queued + self.running >= self.workers + self.queue_depth:
+                self.rejected += 1
+                metrics.inc(f"work_pool_{stage}_rejected_total", help_text="Tasks turned away by a full queue")
+                raise Busy(stage, "queue full", self.retry_after())
+            self.queued += 1
+            depth = self.queued
+        metrics.observe("work_pool_queue_depth", depth, "Tasks waiting for a worker, sampled on submit")
+        return self.executor.submit(self._run, stage, time.monotonic(), fn, args, kwargs)
+
+    def run(self, stage, fn, *args, **kwargs):
+        """submit() and wait for the result; Busy if it is still queued after queue_timeout."""
+        future = self.submit(stage, fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.queue_timeout)
+        except FutureTimeout:
+            if future.cancel():         # still queued: give the slot back
+                with self._lock:
+                    self.queued -= 1
+                    self.timed_out += 1
+                    self._wait_ema = 0.8 * self._wait_ema + 0.2 * self.queue_timeout
+                metrics.inc(f"work_pool_{stage}_timeouts_total", help_text="Tasks dropped after waiting too long")
+                raise Busy(stage, f"no worker free after {self.queue_timeout:g}s", self.retry_after()) from None
+            return future.result()      # already running: let it finish
+
+    def _run(self, stage, enqueued, fn, args, kwargs):
+        waited = time.monotonic() - enqueued
+        with self._lock:
+            self.queued -= 1
+            self._wait_ema = 0.8 * self._wait_ema + 0.2 * waited
+            expired = waited > self.queue_timeout
+            if expired:
+                self.timed_out += 1
+            else:
+                self.running += 1
+        metrics.observe("work_pool_wait_seconds", waited, "Time a task spent queued before a worker took it")
+        if expired:
+            metrics.inc(f"work_pool_{stage}_timeouts_total", help_text="Tasks dropped after waiting too long")
+            raise Busy(stage, f"waited {waited:.1f}s for a worker", self.retry_after())
+        try:
+            with metrics.span(f"work_pool_{stage}"):
+                return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    # ---------------------- STATUS ----------------------
+    def retry_after(self):
+        # Seconds worth waiting before a retry: about one typical queue wait.
+        return max(1, round(self._wait_ema))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "queued": self.queued,
+                "running": self.running,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+